@@ -0,0 +1,207 @@
+"""Benchmarks for the service_finder CLI's database hot paths.
+
+Synthesizes a database of configurable size, then times ingestion, status
+and report generation with warmup and repetitions. Results are emitted as
+JSON so runs can be compared across releases.
+
+    python benchmarks/bench_service_finder.py --users 100 --logs-per-user 1000
+    python benchmarks/bench_service_finder.py --output bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cli"))
+
+import service_finder as sf  # noqa: E402
+
+
+def synthesize(users, agencies, logs_per_user, seed=0):
+    """Fills the current sf.DB_NAME with synthetic users, agencies and logs."""
+    rng = random.Random(seed)
+    sf.setup_database()
+    conn = sf.get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("DELETE FROM Service_Logs")
+    cursor.execute("DELETE FROM User_Profile")
+    cursor.execute("DELETE FROM Agencies")
+    cursor.executemany(
+        "INSERT INTO User_Profile (user_id, full_name, total_hours_required, deadline_date) VALUES (?, ?, ?, ?)",
+        ((u, f"User {u}", 40.0 + u % 200, "2027-06-01") for u in range(1, users + 1)),
+    )
+    cursor.executemany(
+        "INSERT INTO Agencies (agency_id, agency_name, category) VALUES (?, ?, ?)",
+        ((a, f"Agency {a}", f"Category {a % 7}") for a in range(1, agencies + 1)),
+    )
+
+    start = date(2025, 1, 1)
+
+    def rows():
+        for u in range(1, users + 1):
+            for _ in range(logs_per_user):
+                yield (
+                    u,
+                    rng.randint(1, agencies),
+                    (start + timedelta(days=rng.randint(0, 540))).isoformat(),
+                    rng.choice((0.5, 1.0, 2.0, 4.0)),
+                    "Synthetic task",
+                    rng.random() < 0.5,
+                )
+
+    cursor.executemany(
+        """
+        INSERT INTO Service_Logs (user_id, agency_id, service_date, hours_worked, task_description, is_verified)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        rows(),
+    )
+    # Seal now, as every real insert path does, so the first timed
+    # ingestion run doesn't pay for chaining the whole synthetic history.
+    sf.seal_log_entries(cursor)
+    conn.commit()
+
+
+def measure(fn, warmup, repeat):
+    """Runs fn warmup + repeat times and returns timing stats in seconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "samples": samples,
+    }
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="sf-bench-")
+    cwd = os.getcwd()
+    sf.DB_NAME = os.path.join(workdir, "bench.db")
+    sf.DURABILITY = args.durability
+    sf.USER_ID = 1
+    quiet = io.StringIO()
+
+    try:
+        os.chdir(workdir)
+        build_start = time.perf_counter()
+        with contextlib.redirect_stdout(quiet):
+            synthesize(args.users, args.agencies, args.logs_per_user, args.seed)
+        build_seconds = time.perf_counter() - build_start
+
+        entries = [(1, 1.0, "Bench entry", "2026-01-01")] * args.ingest_rows
+
+        def ingest_bulk():
+            with contextlib.redirect_stdout(quiet):
+                sf.log_hours_bulk(entries, args.batch_size)
+
+        def ingest_single():
+            sf.log_hours_entry(1, 1.0, "Bench entry", "2026-01-01")
+
+        def status():
+            with contextlib.redirect_stdout(quiet):
+                sf.show_status()
+
+        def all_status():
+            with contextlib.redirect_stdout(quiet):
+                sf.show_all_status("csv")
+
+        def report():
+            with contextlib.redirect_stdout(quiet):
+                sf.generate_report(echo=False)
+
+        # Read paths first so they see the synthesized size, not the
+        # rows added by the ingestion benchmarks.
+        benchmarks = {
+            "status": status,
+            "status_all_users": all_status,
+            "report": report,
+            "ingest_bulk": ingest_bulk,
+            "ingest_single": ingest_single,
+        }
+        selected = [name for name in benchmarks if not args.only or name in args.only]
+        results = {}
+        for name in selected:
+            results[name] = measure(benchmarks[name], args.warmup, args.repeat)
+            quiet.seek(0)
+            quiet.truncate()
+        if "ingest_bulk" in results:
+            results["ingest_bulk"]["rows_per_sec"] = args.ingest_rows / results["ingest_bulk"]["median"]
+    finally:
+        os.chdir(cwd)
+        sf.close_db_connection()
+        if not args.keep:
+            for name in os.listdir(workdir):
+                os.remove(os.path.join(workdir, name))
+            os.rmdir(workdir)
+
+    return {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "params": {
+            "users": args.users,
+            "agencies": args.agencies,
+            "logs_per_user": args.logs_per_user,
+            "ingest_rows": args.ingest_rows,
+            "batch_size": args.batch_size,
+            "durability": args.durability,
+            "warmup": args.warmup,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "build_seconds": build_seconds,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark service_finder database hot paths")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--agencies", type=int, default=20)
+    parser.add_argument("--logs-per-user", type=int, default=1000)
+    parser.add_argument("--ingest-rows", type=int, default=10000, help="Rows per bulk ingestion run")
+    parser.add_argument("--batch-size", type=int, default=sf.BULK_BATCH_SIZE)
+    parser.add_argument("--durability", choices=sorted(sf.DURABILITY_PROFILES), default=sf.DURABILITY)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=["ingest_bulk", "ingest_single", "status", "status_all_users", "report"],
+        help="Run only the named benchmark (repeatable)",
+    )
+    parser.add_argument("--keep", action="store_true", help="Keep the synthesized database directory")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    results = run(args)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
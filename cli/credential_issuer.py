@@ -0,0 +1,239 @@
+"""Issues ServiceVerified credentials from verified service hours.
+
+Every user whose verified hours meet their requirement gets one credential
+matching schemas/service-verified-v1.0.schema.json, with an evidence
+payload summarising verified hours per agency. Credentials are streamed
+to NDJSON (the format of examples/credential.ndjson and the DID registry).
+Each issue is recorded in Issued_Credentials, and users who already hold a
+credential are skipped unless --reissue is given.
+
+    python cli/credential_issuer.py credentials.ndjson
+    python cli/credential_issuer.py registry.ndjson --append --valid-days 730
+    python cli/credential_issuer.py registry.ndjson --append --user 7 --reissue
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+
+import service_finder as sf
+
+SCHEMA_VERSION = "1.0"
+DID_PREFIX = "did:tw:serviceverified:"
+SOURCE = "servicepath.education.service-hours"
+EVIDENCE_TYPE = "service_hours"
+STATUS = "approved"
+VALID_DAYS = 365
+ISSUE_BATCH = 1000  # credentials per write
+HOURS_EPSILON = 1e-9  # float sums of hours may land a hair under the requirement
+
+# CROSS JOIN pins the join order: filter eligible users from User_Totals
+# first, then reach their logs through idx_service_logs_user_date instead
+# of scanning every log in the table. A log only counts when its latest
+# sealed Log_Verifications entry says verified, so a hand-flipped
+# is_verified flag (which User_Totals follows) never earns a credential.
+ELIGIBLE_QUERY = """
+    SELECT p.user_id, p.full_name, p.total_hours_required, p.deadline_date,
+           s.agency_id, a.agency_name, a.category,
+           SUM(s.hours_worked) AS hours, COUNT(*) AS entries,
+           MIN(s.service_date) AS first_date, MAX(s.service_date) AS last_date
+    FROM User_Totals t
+    CROSS JOIN User_Profile p ON p.user_id = t.user_id
+    CROSS JOIN Service_Logs s ON s.user_id = t.user_id AND s.is_verified AND (
+        SELECT v.verified FROM Log_Verifications v
+        WHERE v.log_id = s.log_id
+        ORDER BY v.verification_id DESC LIMIT 1
+    )
+    LEFT JOIN Agencies a ON a.agency_id = s.agency_id
+    WHERE t.verified_hours + ? >= p.total_hours_required {user_filter} {issued_filter}
+    GROUP BY t.user_id, s.agency_id
+    ORDER BY t.user_id, s.agency_id
+"""
+NOT_ISSUED_FILTER = "AND NOT EXISTS (SELECT 1 FROM Issued_Credentials i WHERE i.user_id = t.user_id)"
+
+def iso_timestamp(moment):
+    """Formats like JavaScript's Date.toISOString(), as the TypeScript builder does."""
+    return moment.astimezone(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+def latest_root(cursor):
+    """The most recently published Merkle root, to anchor evidence to the audit log."""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'Merkle_Roots'")
+    if cursor.fetchone() is None:
+        return None
+    cursor.execute("SELECT tree_size, root_hash, signed_at FROM Merkle_Roots ORDER BY rowid DESC LIMIT 1")
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return {"tree_size": row[0], "root": row[1].hex(), "signed_at": row[2]}
+
+def build_credential(user_rows, issued_at, expires_at, anchor=None, status=STATUS, source=SOURCE):
+    """Builds one credential dict from a user's per-agency rows of ELIGIBLE_QUERY."""
+    first = user_rows[0]
+    agencies = [
+        {
+            "agency_id": row["agency_id"],
+            "agency_name": row["agency_name"],
+            "category": row["category"],
+            "hours": round(row["hours"], 2),
+            "entries": row["entries"],
+        }
+        for row in user_rows
+    ]
+    payload = {
+        "user_id": first["user_id"],
+        "full_name": first["full_name"],
+        "hours_required": first["total_hours_required"],
+        "hours_verified": round(sum(row["hours"] for row in user_rows), 2),
+        "entries": sum(row["entries"] for row in user_rows),
+        "period": {
+            "start": min(row["first_date"] for row in user_rows),
+            "end": max(row["last_date"] for row in user_rows),
+        },
+        "deadline_date": first["deadline_date"],
+        "agencies": agencies,
+    }
+    if anchor:
+        payload["audit_root"] = anchor
+
+    credential_id = str(uuid.uuid4())
+    credential = {
+        "schema_version": SCHEMA_VERSION,
+        "did": DID_PREFIX + credential_id,
+        "id": credential_id,
+        "status": status,
+        "source": source,
+        "created_at": issued_at,
+        "updated_at": issued_at,
+    }
+    if expires_at:
+        credential["expires_at"] = expires_at
+    credential["evidence"] = {"type": EVIDENCE_TYPE, "payload": payload}
+    return credential
+
+def iter_credentials(cursor, valid_days=VALID_DAYS, user_id=None, reissue=False):
+    """Yields a credential per eligible user, streaming the aggregate query.
+
+    Users with a row in Issued_Credentials are skipped unless `reissue`.
+    """
+    now = datetime.now(timezone.utc)
+    issued_at = iso_timestamp(now)
+    expires_at = iso_timestamp(now + timedelta(days=valid_days)) if valid_days else None
+    anchor = latest_root(cursor)
+
+    params = [HOURS_EPSILON]
+    user_filter = ""
+    if user_id is not None:
+        user_filter = "AND t.user_id = ?"
+        params.append(user_id)
+    cursor.arraysize = sf.EXPORT_FETCH_SIZE
+    issued_filter = "" if reissue else NOT_ISSUED_FILTER
+    cursor.execute(ELIGIBLE_QUERY.format(user_filter=user_filter, issued_filter=issued_filter), params)
+
+    for _, user_rows in groupby(cursor, key=lambda row: row["user_id"]):
+        user_rows = list(user_rows)
+        if sum(row["hours"] for row in user_rows) + HOURS_EPSILON < user_rows[0]["total_hours_required"]:
+            continue  # User_Totals counted logs without a sealed verification
+        yield build_credential(user_rows, issued_at, expires_at, anchor)
+
+def open_output(path, append=False):
+    """Opens the output for writing; returns (file, partial path or None).
+
+    Appends go straight to the registry. A replacement is written next to
+    `path` and only renamed over it once something was issued, so a run
+    that issues nothing (or fails) leaves the existing file untouched.
+    """
+    if path == '-':
+        return sys.stdout, None
+    opener = sf.EXPORT_OPENERS.get(os.path.splitext(path)[1].lower(), open)
+    if append:
+        return opener(path, "at", encoding="utf-8", newline=""), None
+    directory, name = os.path.split(path)
+    partial = os.path.join(directory, f".{name}.partial")
+    return opener(partial, "wt", encoding="utf-8", newline=""), partial
+
+def issue_credentials(path, append=False, valid_days=VALID_DAYS, user_id=None, reissue=False):
+    """Streams a credential per eligible user to an NDJSON file.
+
+    Issued credentials are recorded once the file is written, replacing a
+    user's earlier record on reissue. Without `append` or `reissue` an
+    existing file is refused: it holds credentials that re-runs skip, so
+    replacing it would lose the only copy.
+    """
+    if path != '-' and not (append or reissue) and os.path.exists(path) and os.path.getsize(path):
+        print(f"❌ {path} already holds issued credentials; use --append to add to it or --reissue to replace it.")
+        return 0
+    sf.setup_database()
+    conn = sf.get_db_connection()
+    cursor = conn.cursor()
+    # Seal logs and verifications added by other tools so the evidence
+    # only covers entries that are in the audit chain.
+    sf.seal_log_entries(cursor)
+    conn.commit()
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+    start = time.perf_counter()
+    count = 0
+    issued = []
+    written = False
+    out, partial = open_output(path, append)
+    try:
+        batch = []
+        for credential in iter_credentials(cursor, valid_days, user_id, reissue):
+            payload = credential["evidence"]["payload"]
+            issued.append((payload["user_id"], credential["did"], payload["hours_verified"],
+                           payload["entries"], credential["created_at"]))
+            batch.append(encode(credential))
+            if len(batch) >= ISSUE_BATCH:
+                out.write("\n".join(batch) + "\n")
+                count += len(batch)
+                batch = []
+        if batch:
+            out.write("\n".join(batch) + "\n")
+            count += len(batch)
+        written = True
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if partial is not None:
+            if written and count:
+                os.replace(partial, path)
+            else:
+                os.remove(partial)
+    conn.executemany(
+        "INSERT OR REPLACE INTO Issued_Credentials (user_id, did, hours_verified, entries, issued_at) "
+        "VALUES (?, ?, ?, ?, ?)",
+        issued,
+    )
+    conn.commit()
+
+    elapsed = time.perf_counter() - start
+    if path != '-':
+        if count == 0:
+            print("⚠️ No users without a credential have met their verified-hours requirement.")
+        else:
+            rate = count / elapsed if elapsed > 0 else float(count)
+            print(f"✅ Issued {count} credentials to {path} in {elapsed:.3f}s ({rate:,.0f} credentials/sec)")
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Issue ServiceVerified credentials for users with enough verified hours")
+    parser.add_argument("output", help="NDJSON file to write ('-' for stdout; .gz/.bz2/.xz compresses)")
+    parser.add_argument("--append", action="store_true", help="Append to the file (e.g. a DID registry) instead of replacing it")
+    parser.add_argument("--valid-days", type=int, default=VALID_DAYS, help="Days until expires_at; 0 omits it")
+    parser.add_argument("--user", type=int, help="Only issue for this user_id")
+    parser.add_argument("--reissue", action="store_true", help="Also issue for users who already hold a credential")
+    parser.add_argument("--db", help="Database file (default: %(default)s)", default=sf.DB_NAME)
+    args = parser.parse_args()
+
+    sf.DB_NAME = args.db
+    try:
+        issue_credentials(args.output, args.append, args.valid_days, args.user, args.reissue)
+    finally:
+        sf.close_db_connection()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""Validates credential NDJSON against the ServiceVerified JSON Schema.
+
+The schema is compiled once into plain Python checks: type tests become
+isinstance calls, patterns and formats precompiled regexes, enums frozen
+sets and `required` a tuple of keys. Records are then validated in a
+single streaming pass, or split by byte range across worker processes for
+large files. Errors are reported per record with line numbers.
+
+    python cli/credential_validator.py credentials.ndjson
+    python cli/credential_validator.py registry.ndjson --workers 8 --format json
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_SCHEMA = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "schemas", "service-verified-v1.0.schema.json"
+)
+MAX_ERRORS = 100  # errors kept for the report; counting continues past it
+CHUNK_BYTES = 16 << 20  # byte range handed to each worker task
+
+TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "null": type(None),
+    "integer": int,
+    "number": (int, float),
+}
+
+# \Z, not $: Python's $ also matches before a trailing newline.
+FORMATS = {
+    "uuid": re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z"),
+    "date-time": re.compile(
+        r"^\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])[Tt]([01]\d|2[0-3]):[0-5]\d:([0-5]\d|60)"
+        r"(\.\d+)?([Zz]|[+-]([01]\d|2[0-3]):[0-5]\d)\Z",
+        re.ASCII,
+    ),
+    "date": re.compile(r"^\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])\Z", re.ASCII),
+}
+
+# Keywords that only document the schema and never fail a record.
+ANNOTATIONS = {"$schema", "$id", "$comment", "title", "description", "examples", "default"}
+
+def ecma_regex(pattern):
+    """Compiles a JSON Schema pattern with ECMA-262 anchoring.
+
+    ECMA-262's `$` only matches at the end of the input, so `$` outside a
+    character class becomes `\\Z`. re.ASCII keeps `\\d` and `\\w` to ASCII,
+    as in ECMA-262.
+    """
+    out = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "$":
+            char = r"\Z"
+        out.append(char)
+        i += 1
+    return re.compile("".join(out), re.ASCII)
+
+def compile_schema(schema, path="$"):
+    """Compiles a (sub)schema into check(value, errors) -> None.
+
+    A check appends (json_path, message) pairs to `errors`. Paths are fixed
+    at compile time, so a valid record costs no string formatting. Unknown
+    keywords raise ValueError rather than silently passing everything.
+    """
+    unknown = set(schema) - ANNOTATIONS - {
+        "type", "const", "enum", "pattern", "format", "minLength", "maxLength",
+        "required", "properties", "additionalProperties",
+    }
+    if unknown:
+        raise ValueError(f"Unsupported schema keyword(s) at {path}: {', '.join(sorted(unknown))}")
+
+    checks = []
+
+    if "type" in schema:
+        names = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        classes = tuple(
+            cls for name in names for cls in (TYPES[name] if isinstance(TYPES[name], tuple) else (TYPES[name],))
+        )
+        exclude_bool = "boolean" not in names and any(n in ("integer", "number") for n in names)
+        type_message = f"is not of type {' or '.join(names)}"
+
+        def check_type(value, errors):
+            if not isinstance(value, classes) or (exclude_bool and isinstance(value, bool)):
+                errors.append((path, type_message))
+                return False
+            return True
+        checks.append(check_type)
+
+    if "const" in schema:
+        const = schema["const"]
+        const_message = f"must be {json.dumps(const)}"
+
+        def check_const(value, errors):
+            if value != const or type(value) is not type(const):
+                errors.append((path, const_message))
+        checks.append(check_const)
+
+    if "enum" in schema:
+        hashable = all(isinstance(v, (str, int, float, bool, type(None))) for v in schema["enum"])
+        allowed = frozenset(schema["enum"]) if hashable else schema["enum"]
+        enum_message = f"is not one of {', '.join(json.dumps(v) for v in schema['enum'])}"
+
+        def check_enum(value, errors):
+            try:
+                ok = value in allowed
+            except TypeError:  # unhashable value against a frozenset
+                ok = False
+            if not ok:
+                errors.append((path, enum_message))
+        checks.append(check_enum)
+
+    string_checks = []
+    if "pattern" in schema:
+        search = ecma_regex(schema["pattern"]).search
+        string_checks.append((search, f"does not match {schema['pattern']}"))
+    if schema.get("format") in FORMATS:  # unknown formats are annotations, per the spec
+        string_checks.append((FORMATS[schema["format"]].match, f"is not a valid {schema['format']}"))
+    min_length, max_length = schema.get("minLength"), schema.get("maxLength")
+    if string_checks or min_length is not None or max_length is not None:
+        def check_string(value, errors):
+            if not isinstance(value, str):
+                return
+            for test, message in string_checks:
+                if not test(value):
+                    errors.append((path, message))
+            if min_length is not None and len(value) < min_length:
+                errors.append((path, f"is shorter than {min_length}"))
+            if max_length is not None and len(value) > max_length:
+                errors.append((path, f"is longer than {max_length}"))
+        checks.append(check_string)
+
+    required = tuple(schema.get("required", ()))
+    properties = tuple(
+        (name, compile_schema(sub, f"{path}.{name}")) for name, sub in schema.get("properties", {}).items()
+    )
+    additional = schema.get("additionalProperties", True)
+    if required or properties or additional is not True:
+        known = frozenset(schema.get("properties", {}))
+        check_additional = None if isinstance(additional, bool) else compile_schema(additional, f"{path}.*")
+
+        def check_object(value, errors):
+            if not isinstance(value, dict):
+                return
+            for key in required:
+                if key not in value:
+                    errors.append((path, f"missing required property '{key}'"))
+            for key, check in properties:
+                if key in value:
+                    check(value[key], errors)
+            if additional is True:
+                return
+            for key in value.keys() - known:
+                if check_additional is None:
+                    errors.append((path, f"unexpected property '{key}'"))
+                else:
+                    check_additional(value[key], errors)
+        checks.append(check_object)
+
+    if not checks:
+        return lambda value, errors: None
+    if len(checks) == 1:
+        return checks[0]
+    if "type" in schema:
+        # A value of the wrong type skips the remaining checks, as their
+        # messages would only restate the type error.
+        first, rest = checks[0], tuple(checks[1:])
+
+        def check(value, errors):
+            if first(value, errors):
+                for c in rest:
+                    c(value, errors)
+        return check
+    checks = tuple(checks)
+
+    def check(value, errors):
+        for c in checks:
+            c(value, errors)
+    return check
+
+def load_validator(schema_path=DEFAULT_SCHEMA):
+    with open(schema_path, encoding="utf-8") as f:
+        return compile_schema(json.load(f))
+
+def validate_lines(lines, check, first_line=1, max_errors=MAX_ERRORS):
+    """Validates an iterable of NDJSON lines.
+
+    Returns (lines, records, invalid, errors) where errors holds up to
+    `max_errors` (line_number, json_path, message) tuples.
+    """
+    loads = json.loads
+    records = invalid = 0
+    errors = []
+    number = first_line - 1
+    for number, line in enumerate(lines, first_line):
+        if not line.strip():
+            continue
+        records += 1
+        try:
+            record = loads(line)
+        except ValueError as exc:
+            invalid += 1
+            if len(errors) < max_errors:
+                errors.append((number, "$", f"invalid JSON: {exc}"))
+            continue
+        found = []
+        check(record, found)
+        if found:
+            invalid += 1
+            for path, message in found[:max(0, max_errors - len(errors))]:
+                errors.append((number, path, message))
+    return number - first_line + 1, records, invalid, errors
+
+def split_ranges(path, chunk_bytes=CHUNK_BYTES):
+    """Splits a file into byte ranges that start and end on line boundaries."""
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            if end < size:
+                f.seek(end)
+                f.readline()  # run to the end of the line the cut landed in
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+_worker_check = {}
+
+def _validate_range(path, schema_path, start, end, max_errors):
+    """Pool worker: validates one byte range; line numbers are range-relative."""
+    check = _worker_check.get(schema_path)
+    if check is None:
+        check = _worker_check[schema_path] = load_validator(schema_path)
+    with open(path, "rb") as f:
+        f.seek(start)
+        lines = f.read(end - start).split(b"\n")
+    if lines[-1] == b"":
+        lines.pop()  # ranges end just past a newline
+    return validate_lines(lines, check, 1, max_errors)
+
+def validate_file(path, schema_path=DEFAULT_SCHEMA, workers=1, max_errors=MAX_ERRORS, chunk_bytes=CHUNK_BYTES):
+    """Validates an NDJSON file; returns (records, invalid, errors)."""
+    if workers <= 1 or path == '-':
+        check = load_validator(schema_path)
+        if path == '-':
+            _, records, invalid, errors = validate_lines(sys.stdin.buffer, check, 1, max_errors)
+        else:
+            with open(path, "rb") as f:
+                _, records, invalid, errors = validate_lines(f, check, 1, max_errors)
+        return records, invalid, errors
+
+    load_validator(schema_path)  # fail on a bad schema before starting workers
+    ranges = split_ranges(path, chunk_bytes)
+    records = invalid = 0
+    errors = []
+    line_offset = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_validate_range, path, schema_path, start, end, max_errors)
+            for start, end in ranges
+        ]
+        for future in futures:
+            lines, chunk_records, chunk_invalid, chunk_errors = future.result()
+            records += chunk_records
+            invalid += chunk_invalid
+            for number, json_path, message in chunk_errors[:max(0, max_errors - len(errors))]:
+                errors.append((number + line_offset, json_path, message))
+            line_offset += lines
+    return records, invalid, errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate credential NDJSON against the ServiceVerified schema")
+    parser.add_argument("files", nargs="+", help="NDJSON files ('-' for stdin)")
+    parser.add_argument("--schema", default=DEFAULT_SCHEMA, help="JSON Schema file (default: service-verified v1.0)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes, each validating a byte range")
+    parser.add_argument("--max-errors", type=int, default=MAX_ERRORS, help="Errors to report per file")
+    parser.add_argument("--format", choices=["text", "json"], default="text", help="Error output format")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.files:
+        start = time.perf_counter()
+        try:
+            records, invalid, errors = validate_file(path, args.schema, args.workers, args.max_errors)
+        except (OSError, ValueError) as exc:
+            print(f"❌ {path}: {exc}", file=sys.stderr)
+            failed = True
+            continue
+        elapsed = time.perf_counter() - start
+
+        for number, json_path, message in errors:
+            if args.format == "json":
+                print(json.dumps({"file": path, "line": number, "path": json_path, "error": message}))
+            else:
+                print(f"{path}:{number}: {json_path} {message}")
+        rate = records / elapsed if elapsed > 0 else float(records)
+        if invalid:
+            failed = True
+            print(f"❌ {path}: {invalid} of {records} records invalid ({elapsed:.3f}s, {rate:,.0f} records/sec)",
+                  file=sys.stderr)
+        else:
+            print(f"✅ {path}: {records} records valid ({elapsed:.3f}s, {rate:,.0f} records/sec)", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
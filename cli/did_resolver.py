@@ -0,0 +1,307 @@
+"""Resolves DIDs from an append-only NDJSON registry through a persisted index.
+
+The registry is the file-backed store chosen in
+docs/DID-RESOLUTION-STRATEGY.md: one record per line, last write wins.
+Lines are either registry operations ({"did", "document", "operation", ...})
+or bare credentials like examples/credential.ndjson, which resolve to
+themselves.
+
+Next to the registry sits `<registry>.idx`, an open-addressing hash table
+of DID -> byte offset of the DID's latest line. A lookup probes a slot or
+two of the mmapped index and reads a single line of the mmapped registry,
+so resolving costs the same in a 10 KB file and a 10 GB one. When the
+registry has grown the index is extended from where it left off; if the
+registry was rewritten or truncated it is rebuilt.
+
+    python cli/did_resolver.py registry.ndjson did:tw:serviceverified:<uuid>
+    python cli/did_resolver.py registry.ndjson --reindex --stats
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"SVDIDX1\0"
+# magic, slot count, DID count, registry bytes indexed, digest of the bytes before that point
+INDEX_HEADER = struct.Struct("<8sQQQ16s")
+INDEX_HEADER_SIZE = 64
+SLOT = struct.Struct("<16sQ")  # DID key, line offset + 1 (0 marks an empty slot)
+MIN_SLOTS = 1024
+MAX_LOAD = 0.5
+TAIL_BYTES = 64  # registry bytes hashed to notice the file being rewritten
+
+# The layouts the issuers write; anything else falls back to a full parse.
+DID_FAST_PATH = re.compile(rb'\{"(?:schema_version":"[^"\\]*","did|did)":"([^"\\]+)"')
+
+def did_key(did):
+    return hashlib.blake2b(did, digest_size=16).digest()
+
+def line_did(line):
+    """Top-level "did" of one registry line, as bytes (None if it has none)."""
+    match = DID_FAST_PATH.match(line)
+    if match:
+        return match.group(1)
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    did = record.get("did") if isinstance(record, dict) else None
+    return did.encode("utf-8") if isinstance(did, str) else None
+
+def tail_digest(data, end):
+    return hashlib.blake2b(data[max(0, end - TAIL_BYTES):end], digest_size=16).digest()
+
+class HashIndex:
+    """Open-addressing table over a writable buffer (bytearray or mmap)."""
+
+    def __init__(self, buf, slots, count):
+        self.buf = buf
+        self.slots = slots
+        self.mask = slots - 1
+        self.count = count
+
+    @classmethod
+    def empty(cls, slots):
+        return cls(bytearray(INDEX_HEADER_SIZE + slots * SLOT.size), slots, 0)
+
+    def _probe(self, key):
+        """Returns (position, stored offset) of key's slot, or of the empty slot it would take."""
+        i = int.from_bytes(key[:8], "little") & self.mask
+        while True:
+            pos = INDEX_HEADER_SIZE + i * SLOT.size
+            stored, offset = SLOT.unpack_from(self.buf, pos)
+            if offset == 0 or stored == key:
+                return pos, offset
+            i = (i + 1) & self.mask
+
+    def get(self, key):
+        offset = self._probe(key)[1]
+        return offset - 1 if offset else None
+
+    def put(self, key, offset):
+        pos, stored = self._probe(key)
+        if stored == 0:
+            self.count += 1
+        SLOT.pack_into(self.buf, pos, key, offset + 1)
+
+    def full(self, extra=1):
+        return self.count + extra > self.slots * MAX_LOAD
+
+    def grown(self):
+        """A copy with twice the slots, rehashed from this table alone."""
+        bigger = HashIndex.empty(self.slots * 2)
+        for pos in range(INDEX_HEADER_SIZE, len(self.buf), SLOT.size):
+            key, offset = SLOT.unpack_from(self.buf, pos)
+            if offset:
+                bigger.put(key, offset - 1)
+        return bigger
+
+class DIDResolver:
+    """O(1) DID lookups against an NDJSON registry, keeping its index current.
+
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, registry_path, index_path=None):
+        self.registry_path = registry_path
+        self.index_path = index_path or registry_path + INDEX_SUFFIX
+        self._registry = None
+        self._registry_map = None
+        self._index_file = None
+        self.index = None
+        self.indexed = 0
+        self._seen = None  # registry (size, mtime, inode) at the last refresh
+        self.refresh()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._unmap_registry()
+        self._unmap_index()
+
+    def _unmap_registry(self):
+        if self._registry_map is not None:
+            self._registry_map.close()
+            self._registry_map = None
+        if self._registry is not None:
+            self._registry.close()
+            self._registry = None
+
+    def _unmap_index(self):
+        if self.index is not None and isinstance(self.index.buf, mmap.mmap):
+            self.index.buf.close()
+        self.index = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+
+    def _map_registry(self):
+        """(Re)maps the registry; returns its size."""
+        self._unmap_registry()
+        self._registry = open(self.registry_path, "rb")
+        st = os.fstat(self._registry.fileno())
+        self._seen = (st.st_size, st.st_mtime_ns, st.st_ino)
+        size = st.st_size
+        if size:
+            self._registry_map = mmap.mmap(self._registry.fileno(), 0, access=mmap.ACCESS_READ)
+        return size
+
+    def _load_index(self, data, size):
+        """Maps an existing index file if it still describes this registry."""
+        self._unmap_index()
+        try:
+            f = open(self.index_path, "r+b")
+        except FileNotFoundError:
+            return False
+        header = f.read(INDEX_HEADER_SIZE)
+        if len(header) < INDEX_HEADER_SIZE:
+            f.close()
+            return False
+        magic, slots, count, indexed, digest = INDEX_HEADER.unpack_from(header)
+        valid = (
+            magic == INDEX_MAGIC
+            and os.fstat(f.fileno()).st_size == INDEX_HEADER_SIZE + slots * SLOT.size
+            and indexed <= size
+            and (indexed == 0 or tail_digest(data, indexed) == digest)
+        )
+        if not valid:
+            f.close()
+            return False
+        self._index_file = f
+        self.index = HashIndex(mmap.mmap(f.fileno(), 0), slots, count)
+        self.indexed = indexed
+        return True
+
+    def refresh(self, rebuild=False):
+        """Brings the index up to date with the registry; returns lines indexed."""
+        size = self._map_registry()
+        data = self._registry_map or b""
+        if rebuild or not self._load_index(data, size):
+            self._unmap_index()
+            self.index = HashIndex.empty(MIN_SLOTS)
+            self.indexed = 0
+        if self.indexed == size and isinstance(self.index.buf, mmap.mmap):
+            return 0
+
+        index = self.index
+        pos, added = self.indexed, 0
+        while True:
+            end = data.find(b"\n", pos, size)
+            if end < 0:
+                break  # a partial last line is picked up once its writer finishes it
+            did = line_did(data[pos:end])
+            if did is not None:
+                if index.full():
+                    index = index.grown()
+                index.put(did_key(did), pos)
+            pos = end + 1
+            added += 1
+
+        if index is not self.index or not isinstance(index.buf, mmap.mmap):
+            self._write_index(index, data, pos)
+        else:
+            self._write_header(index.buf, index, data, pos)
+            index.buf.flush()
+        self.indexed = pos
+        return added
+
+    def _write_header(self, buf, index, data, indexed):
+        INDEX_HEADER.pack_into(
+            buf, 0, INDEX_MAGIC, index.slots, index.count, indexed, tail_digest(data, indexed)
+        )
+
+    def _write_index(self, index, data, indexed):
+        """Writes a whole (new or grown) table atomically and maps it."""
+        self._write_header(index.buf, index, data, indexed)
+        self._unmap_index()
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(index.buf)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+        self._load_index(data, len(data))
+
+    def _stale(self):
+        """Whether the registry changed since the last refresh.
+
+        Compares against what refresh() saw rather than self.indexed, which
+        stops short of a partial last line; otherwise every lookup would
+        re-map the registry until the writer finished that line.
+        """
+        st = os.stat(self.registry_path)
+        return (st.st_size, st.st_mtime_ns, st.st_ino) != self._seen
+
+    def record(self, did):
+        """The latest registry record for `did`, or None."""
+        if self._stale():
+            self.refresh()
+        raw = did.strip().encode("utf-8")
+        offset = self.index.get(did_key(raw))
+        if offset is None:
+            return None
+        data = self._registry_map
+        line = data[offset:data.find(b"\n", offset, self.indexed)]
+        record = json.loads(line)
+        return record if record.get("did") == raw.decode("utf-8") else None
+
+    def resolve(self, did):
+        """The current document for `did`; None if unknown or deactivated."""
+        record = self.record(did)
+        if record is None or record.get("operation") == "deactivate":
+            return None
+        return record.get("document", record)
+
+    def stats(self):
+        return {
+            "registry": self.registry_path,
+            "registry_bytes": self.indexed,
+            "dids": self.index.count,
+            "slots": self.index.slots,
+            "index_bytes": INDEX_HEADER_SIZE + self.index.slots * SLOT.size,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve DIDs from an NDJSON registry via a persisted offset index")
+    parser.add_argument("registry", help="NDJSON registry (e.g. data/did-registry.ndjson)")
+    parser.add_argument("dids", nargs="*", help="DIDs to resolve ('-' reads them from stdin, one per line)")
+    parser.add_argument("--index", help="Index file (default: <registry>.idx)")
+    parser.add_argument("--reindex", action="store_true", help="Rebuild the index from scratch")
+    parser.add_argument("--stats", action="store_true", help="Print index statistics as JSON")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.registry):
+        print(f"❌ Registry not found: {args.registry}", file=sys.stderr)
+        sys.exit(1)
+
+    missing = 0
+    with DIDResolver(args.registry, args.index) as resolver:
+        if args.reindex:
+            lines = resolver.refresh(rebuild=True)
+            print(f"✅ Indexed {lines} lines ({resolver.index.count} DIDs)", file=sys.stderr)
+        if args.stats:
+            print(json.dumps(resolver.stats(), indent=2))
+
+        dids = args.dids
+        if dids == ["-"]:
+            dids = (line for line in sys.stdin if line.strip())
+        for did in dids:
+            document = resolver.resolve(did)
+            if document is None:
+                print(f"❌ DID not found: {did.strip()}", file=sys.stderr)
+                missing += 1
+            else:
+                print(json.dumps(document, ensure_ascii=False))
+    sys.exit(1 if missing else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""JSON HTTP API over the service_finder database.
+
+A small asyncio HTTP/1.1 server. SQLite reads run on a bounded thread
+pool, each call borrowing a warm connection from a ConnectionPool; log
+submissions go through a LogWriteQueue so concurrent writes are
+group-committed by a single writer.
+
+    python cli/service_api.py --port 8765 --workers 8
+
+Routes: GET /health, /status, /status/all, /agencies?q=, /report; POST /log.
+"""
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+import service_finder as sf
+
+SERVE_HOST = '127.0.0.1'
+SERVE_PORT = 8765
+SERVE_BACKLOG = 512
+SERVE_IDLE_TIMEOUT = 30
+SERVE_MAX_BODY = 1 << 20
+
+HTTP_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+                405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ServiceAPI:
+    def __init__(self, workers=sf.POOL_SIZE):
+        self.pool = sf.ConnectionPool(workers)
+        self.pool.warm()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sqlite")
+        self.agencies = sf.AgencyCache(sf.open_db_connection(check_same_thread=False))
+        self.writer = sf.LogWriteQueue()
+        self.routes = {
+            ("GET", "/health"): lambda conn, query, body: {"ok": True},
+            ("GET", "/status"): self.status,
+            ("GET", "/status/all"): self.status_all,
+            ("GET", "/agencies"): self.list_agencies,
+            ("GET", "/report"): self.report,
+            ("POST", "/log"): self.log,
+        }
+
+    def close(self):
+        self.writer.close()
+        self.executor.shutdown(wait=True)
+        self.pool.close()
+
+    def _run(self, handler, query, body):
+        with self.pool.connection() as conn:
+            return handler(conn, query, body)
+
+    async def dispatch(self, method, path, query, body):
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                raise HTTPError(405, f"{method} not allowed on {path}")
+            raise HTTPError(404, f"No route for {path}")
+        if asyncio.iscoroutinefunction(handler):
+            return await handler(query, body)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._run, handler, query, body)
+
+    @staticmethod
+    def _user_id(query):
+        try:
+            return int(query.get("user_id", [sf.USER_ID])[0])
+        except ValueError:
+            raise HTTPError(400, "user_id must be an integer") from None
+
+    def status(self, conn, query, body):
+        result = sf.fetch_status(conn.cursor(), self._user_id(query))
+        if result is None:
+            raise HTTPError(404, "Unknown user")
+        return result
+
+    def status_all(self, conn, query, body):
+        cursor = conn.cursor()
+        cursor.execute(sf.ALL_STATUS_QUERY)
+        return [
+            {
+                "user_id": row['user_id'],
+                "full_name": row['full_name'],
+                "goal": row['Goal'],
+                "completed": row['Completed'],
+                "remaining": row['Remaining'],
+                "days_left": row['Days_Left'],
+                "burn_rate": sf.burn_rate(row['Remaining'], row['Days_Left']),
+            }
+            for row in cursor
+        ]
+
+    def list_agencies(self, conn, query, body):
+        text = query.get("q", [""])[0]
+        return [dict(row) for row in self.agencies.search(text)]
+
+    def report(self, conn, query, body):
+        user_id = self._user_id(query)
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM User_Profile WHERE user_id = ?", (user_id,))
+        user = cursor.fetchone()
+        if user is None:
+            raise HTTPError(404, "Unknown user")
+        cursor.execute(sf.REPORT_QUERY, (user_id,))
+        entries = [dict(row) for row in cursor]
+        total = sum(entry['hours_worked'] for entry in entries)
+        return {
+            "user": dict(user),
+            "entries": entries,
+            "total_hours": total,
+            "remaining_hours": user['total_hours_required'] - total,
+        }
+
+    def _user_exists(self, user_id):
+        with self.pool.connection() as conn:
+            return sf.user_exists(conn.cursor(), user_id)
+
+    async def log(self, query, body):
+        try:
+            payload = json.loads(body or b"{}")
+            user_id = int(payload.get("user_id", sf.USER_ID))
+            agency_id = int(payload["agency_id"])
+            hours = sf.parse_hours(payload["hours"])
+            desc = str(payload.get("description", ""))
+            date = payload.get("date") or datetime.now().strftime("%Y-%m-%d")
+            datetime.strptime(date, "%Y-%m-%d")
+        except (KeyError, TypeError, ValueError) as exc:
+            raise HTTPError(400, f"Invalid log entry: {exc}") from None
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(self.executor, self._user_exists, user_id):
+            raise HTTPError(400, f"Unknown user_id {user_id}")
+        if await loop.run_in_executor(self.executor, self.agencies.get, agency_id) is None:
+            raise HTTPError(400, f"Unknown agency_id {agency_id}")
+
+        # Group-committed with other concurrent submissions; resolves once durable.
+        log_id = await self.writer.submit_async(user_id, agency_id, date, hours, desc)
+        return 201, {"log_id": log_id}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), SERVE_IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line.strip():
+                    break
+                keep_alive = await self.handle_request(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, request_line, reader, writer):
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            self.respond(writer, 400, {"error": "Malformed request line"}, False)
+            return False
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            keep_alive = connection != "close"
+        else:
+            keep_alive = connection == "keep-alive"
+
+        # Plain ASCII digits only: int() would also take "-5", "+5", "1_0" and "٥".
+        raw_length = headers.get("content-length") or "0"
+        if not (raw_length.isascii() and raw_length.isdigit()):
+            self.respond(writer, 400, {"error": "Invalid Content-Length"}, False)
+            return False
+        length = int(raw_length)
+        if length > SERVE_MAX_BODY:
+            self.respond(writer, 413, {"error": "Request body too large"}, False)
+            return False
+        body = await reader.readexactly(length) if length else b""
+
+        url = urlsplit(target)
+        try:
+            result = await self.dispatch(method, url.path.rstrip("/") or "/", parse_qs(url.query), body)
+            status = 200
+            if isinstance(result, tuple):
+                status, result = result
+        except HTTPError as exc:
+            status, result = exc.status, {"error": str(exc)}
+        except Exception as exc:
+            status, result = 500, {"error": f"{type(exc).__name__}: {exc}"}
+        self.respond(writer, status, result, keep_alive)
+        return keep_alive
+
+    @staticmethod
+    def respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+        )
+
+async def _serve(host, port, workers):
+    api = ServiceAPI(workers)
+    server = await asyncio.start_server(api.handle_connection, host, port, backlog=SERVE_BACKLOG)
+    addresses = ", ".join(f"http://{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+    print(f"🌐 Serving on {addresses} ({workers} SQLite workers). Ctrl+C to stop.")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        api.close()
+
+def serve(host=SERVE_HOST, port=SERVE_PORT, workers=sf.POOL_SIZE):
+    try:
+        asyncio.run(_serve(host, port, workers))
+    except KeyboardInterrupt:
+        print("\n🛑 Server stopped.")
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the service_finder database as a JSON HTTP API")
+    parser.add_argument("--host", default=SERVE_HOST, help=f"Bind address (default {SERVE_HOST})")
+    parser.add_argument("--port", type=int, default=SERVE_PORT, help=f"Port (default {SERVE_PORT})")
+    parser.add_argument("--workers", type=int, default=sf.POOL_SIZE,
+                        help=f"SQLite reader threads and pooled connections (default {sf.POOL_SIZE})")
+    parser.add_argument("--user", type=int, help=f"Default user_id for requests without one (default {sf.USER_ID})")
+    parser.add_argument("--durability", choices=sorted(sf.DURABILITY_PROFILES), default=sf.DURABILITY,
+                        help=f"SQLite durability/speed profile (default {sf.DURABILITY})")
+    parser.add_argument("--db", default=sf.DB_NAME, help="Database file (default: %(default)s)")
+    args = parser.parse_args()
+
+    sf.DB_NAME = args.db
+    sf.DURABILITY = args.durability
+    if args.user is not None:
+        sf.USER_ID = args.user
+    try:
+        sf.setup_database()
+        serve(args.host, args.port, args.workers)
+    finally:
+        sf.close_db_connection()
+
+if __name__ == "__main__":
+    main()
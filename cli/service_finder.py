@@ -1,21 +1,336 @@
 import argparse
+import asyncio
+import bisect
+import bz2
+import csv
+import gzip
+import hashlib
+import hmac
+import json
+import lzma
+import math
+import os
+import queue
 import sqlite3
-from datetime import datetime
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from difflib import get_close_matches
+from datetime import datetime, timedelta
+from itertools import islice
+from urllib.request import pathname2url
+
+try:  # optional: vectorizes --forecast for very large caseloads
+    import numpy as np
+except ImportError:
+    np = None
 
 # CONFIGURATION
 DB_NAME = 'service_finder.db'
 USER_ID = 1
+BULK_BATCH_SIZE = 1000
+WRITE_QUEUE_BATCH = 500
+WRITE_QUEUE_DELAY = 0.01  # seconds a batch waits for more submissions
+DURABILITY = 'safe'
+REPORT_CHUNK_LINES = 500
+REPORT_BUFFER_SIZE = 1 << 16
+REPORT_WORKERS = min(8, os.cpu_count() or 1)
+EXPORT_FETCH_SIZE = 5000
+AGENCY_LIST_LIMIT = 20
+SEARCH_PAGE_SIZE = 20
+CHAIN_BATCH_SIZE = 5000
+CHAIN_CHECKPOINT_INTERVAL = 100000
+CHAIN_MAX_PROBLEMS = 20
+SIGNING_KEY_ENV = 'SERVICE_FINDER_SIGNING_KEY'
+FORECAST_WINDOWS = (7, 28)  # short and long pace windows, in days
+FORECAST_SHORT_WEIGHT = 0.5
 
-def get_db_connection():
-    conn = sqlite3.connect(DB_NAME)
+# Pragmas applied to every new connection, per durability profile.
+# All profiles use WAL so status/report readers never block a writer.
+DURABILITY_PROFILES = {
+    'safe': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+    },
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -256000,
+        'mmap_size': 1024 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
+POOL_SIZE = 4
+
+_local = threading.local()
+
+# --- PROFILING (--profile) ---
+# When PROFILER is set, every connection is a ProfiledConnection whose
+# cursors record wall time, rows returned and approximate SQLite VM steps
+# per statement; run_commands() wraps each top-level command in
+# profile_phase(). Phases may nest (connect happens inside a command), so
+# TOTAL is wall time since the profiler started, not the sum of phases.
+PROFILER = None
+PROFILE_STEP = 1000  # VM instructions between progress-handler callbacks
+
+class Profiler:
+    def __init__(self):
+        self.phases = []
+        self.statements = {}
+        self._lock = threading.Lock()
+        self._current = threading.local()
+        self._started = time.perf_counter()
+
+    def add_phase(self, name, seconds):
+        with self._lock:
+            self.phases.append({"phase": name, "seconds": seconds})
+
+    def _stats(self, sql):
+        key = " ".join(sql.split())
+        with self._lock:
+            stats = self.statements.get(key)
+            if stats is None:
+                stats = self.statements[key] = {"sql": key, "calls": 0, "seconds": 0.0, "rows": 0, "vm_steps": 0}
+            return stats
+
+    def begin(self, sql):
+        stats = self._stats(sql)
+        with self._lock:
+            stats["calls"] += 1
+        self._current.stats = stats
+        return stats
+
+    def resume(self, stats):
+        self._current.stats = stats
+
+    def record(self, stats, seconds, rows=0):
+        self._current.stats = None
+        with self._lock:
+            stats["seconds"] += seconds
+            stats["rows"] += rows
+
+    def on_progress(self):
+        stats = getattr(self._current, 'stats', None)
+        if stats is not None:
+            with self._lock:
+                stats["vm_steps"] += PROFILE_STEP
+        return 0
+
+    def trace(self, sql):
+        # Statements run by SQLite itself (e.g. pragmas at connect time)
+        # never pass through a cursor; count them so nothing is hidden.
+        if getattr(self._current, 'stats', None) is None:
+            stats = self._stats(sql)
+            with self._lock:
+                stats["calls"] += 1
+
+    def to_dict(self):
+        statements = sorted(self.statements.values(), key=lambda s: s["seconds"], reverse=True)
+        return {
+            "total_seconds": time.perf_counter() - self._started,
+            "phases": self.phases,
+            "statements": statements,
+        }
+
+    def print_breakdown(self, stream=None):
+        stream = stream or sys.stderr
+        data = self.to_dict()
+        print("\n--- ⏱️ PROFILE ---", file=stream)
+        for phase in data["phases"]:
+            print(f"{phase['seconds'] * 1000:10.2f} ms  {phase['phase']}", file=stream)
+        print(f"{data['total_seconds'] * 1000:10.2f} ms  TOTAL", file=stream)
+        print(f"\n{'MS':>10}  {'CALLS':>6}  {'ROWS':>8}  {'VM STEPS':>10}  SQL", file=stream)
+        for stmt in data["statements"]:
+            print(f"{stmt['seconds'] * 1000:10.2f}  {stmt['calls']:>6}  {stmt['rows']:>8}  "
+                  f"{stmt['vm_steps']:>10}  {stmt['sql'][:70]}", file=stream)
+
+@contextmanager
+def profile_phase(name):
+    if PROFILER is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PROFILER.add_phase(name, time.perf_counter() - start)
+
+class ProfilingCursor(sqlite3.Cursor):
+    _stats = None
+
+    def execute(self, sql, parameters=()):
+        self._stats = PROFILER.begin(sql)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            PROFILER.record(self._stats, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._stats = PROFILER.begin(sql)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            PROFILER.record(self._stats, time.perf_counter() - start)
+
+    def _timed_fetch(self, fetch, *args):
+        if self._stats is None:
+            return fetch(*args)
+        PROFILER.resume(self._stats)
+        start = time.perf_counter()
+        result = fetch(*args)
+        if isinstance(result, list):
+            rows = len(result)
+        else:
+            rows = 0 if result is None else 1
+        PROFILER.record(self._stats, time.perf_counter() - start, rows)
+        return result
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._timed_fetch(super().fetchmany, size or self.arraysize)
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall)
+
+    def __next__(self):
+        if self._stats is None:
+            return super().__next__()
+        PROFILER.resume(self._stats)
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            PROFILER.record(self._stats, time.perf_counter() - start)
+            raise
+        PROFILER.record(self._stats, time.perf_counter() - start, 1)
+        return row
+
+class ProfiledConnection(sqlite3.Connection):
+    def cursor(self, factory=ProfilingCursor):
+        return super().cursor(factory)
+
+def _connect(database, **kwargs):
+    if PROFILER is None:
+        return sqlite3.connect(database, **kwargs)
+    start = time.perf_counter()
+    conn = sqlite3.connect(database, factory=ProfiledConnection, **kwargs)
+    conn.set_progress_handler(PROFILER.on_progress, PROFILE_STEP)
+    conn.set_trace_callback(PROFILER.trace)
+    PROFILER.add_phase("connect", time.perf_counter() - start)
+    return conn
+
+def open_db_connection(check_same_thread=True):
+    """Opens a fresh connection. Most callers want get_db_connection()."""
+    conn = _connect(DB_NAME, check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
+    apply_durability(conn, DURABILITY)
     return conn
 
-def setup_database():
-    """Checks if DB exists; if not, builds the schema and seeds data."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
+def apply_durability(conn, profile):
+    """Applies the pragmas of a durability profile to an open connection."""
+    try:
+        pragmas = DURABILITY_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown durability profile: {profile}") from None
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+def open_readonly_connection(db_name=None):
+    """Opens a read-only connection for report workers and other readers."""
+    path = os.path.abspath(db_name or DB_NAME)
+    conn = _connect(f"file:{pathname2url(path)}?mode=ro", uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    for name in ('cache_size', 'mmap_size', 'temp_store'):
+        conn.execute(f"PRAGMA {name} = {DURABILITY_PROFILES[DURABILITY][name]}")
+    return conn
+
+def get_db_connection():
+    """Returns this thread's shared connection, opening it on first use."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.db_name != DB_NAME:
+        if conn is not None:
+            conn.close()
+        conn = open_db_connection()
+        _local.conn = conn
+        _local.db_name = DB_NAME
+    return conn
+
+def close_db_connection():
+    """Closes this thread's shared connection (if any)."""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+class ConnectionPool:
+    """Small fixed-size pool for multi-threaded callers.
+
+    Connections are opened lazily with check_same_thread=False and handed to
+    one thread at a time via connection().
+    """
+
+    def __init__(self, size=POOL_SIZE):
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                return open_db_connection(check_same_thread=False)
+        return self._idle.get()
+
+    def warm(self):
+        """Opens every connection up front so first requests don't pay for it."""
+        with self._lock:
+            while self._opened < self.size:
+                self._opened += 1
+                self._idle.put(open_db_connection(check_same_thread=False))
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self._opened = 0
+
+def migrate_base_schema(cursor):
+    """v1: core tables plus the default user and sample agencies."""
     # 1. Create Tables (IF NOT EXISTS prevents errors)
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS User_Profile (
@@ -75,62 +390,675 @@ def setup_database():
             ('Community Library', 'Education', 'Address', 'Contact'),
             ('Environmental Nonprofit', 'Environment', 'Address', 'Contact')
         """)
-        
+
+def migrate_service_log_indexes(cursor):
+    """v2: covering index for per-user status sums and date-ordered reports."""
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_service_logs_user_date
+    ON Service_Logs (user_id, service_date, hours_worked, agency_id);
+    """)
+
+def migrate_user_totals(cursor):
+    """v3: User_Totals summary kept current by triggers on Service_Logs."""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS User_Totals (
+        user_id INTEGER PRIMARY KEY,
+        total_hours REAL NOT NULL DEFAULT 0,
+        verified_hours REAL NOT NULL DEFAULT 0,
+        last_service_date DATE,
+        entry_count INTEGER NOT NULL DEFAULT 0
+    );
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_service_logs_totals_insert
+    AFTER INSERT ON Service_Logs
+    WHEN NEW.user_id IS NOT NULL
+    BEGIN
+        INSERT INTO User_Totals (user_id, total_hours, verified_hours, last_service_date, entry_count)
+        VALUES (
+            NEW.user_id,
+            NEW.hours_worked,
+            CASE WHEN NEW.is_verified THEN NEW.hours_worked ELSE 0 END,
+            NEW.service_date,
+            1
+        )
+        ON CONFLICT(user_id) DO UPDATE SET
+            total_hours = total_hours + excluded.total_hours,
+            verified_hours = verified_hours + excluded.verified_hours,
+            last_service_date = MAX(IFNULL(last_service_date, ''), excluded.last_service_date),
+            entry_count = entry_count + 1;
+    END;
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_service_logs_totals_delete
+    AFTER DELETE ON Service_Logs
+    WHEN OLD.user_id IS NOT NULL
+    BEGIN
+        UPDATE User_Totals SET
+            total_hours = total_hours - OLD.hours_worked,
+            verified_hours = verified_hours - CASE WHEN OLD.is_verified THEN OLD.hours_worked ELSE 0 END,
+            last_service_date = (SELECT MAX(service_date) FROM Service_Logs WHERE user_id = OLD.user_id),
+            entry_count = entry_count - 1
+        WHERE user_id = OLD.user_id;
+    END;
+    """)
+
+    # An UPDATE is a delete of OLD followed by an insert of NEW.
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_service_logs_totals_update
+    AFTER UPDATE OF user_id, service_date, hours_worked, is_verified ON Service_Logs
+    BEGIN
+        UPDATE User_Totals SET
+            total_hours = total_hours - OLD.hours_worked,
+            verified_hours = verified_hours - CASE WHEN OLD.is_verified THEN OLD.hours_worked ELSE 0 END,
+            last_service_date = (SELECT MAX(service_date) FROM Service_Logs WHERE user_id = OLD.user_id),
+            entry_count = entry_count - 1
+        WHERE user_id = OLD.user_id;
+
+        INSERT INTO User_Totals (user_id, total_hours, verified_hours, last_service_date, entry_count)
+        SELECT
+            NEW.user_id,
+            NEW.hours_worked,
+            CASE WHEN NEW.is_verified THEN NEW.hours_worked ELSE 0 END,
+            (SELECT MAX(service_date) FROM Service_Logs WHERE user_id = NEW.user_id),
+            1
+        WHERE NEW.user_id IS NOT NULL
+        ON CONFLICT(user_id) DO UPDATE SET
+            total_hours = total_hours + excluded.total_hours,
+            verified_hours = verified_hours + excluded.verified_hours,
+            last_service_date = excluded.last_service_date,
+            entry_count = entry_count + 1;
+    END;
+    """)
+
+    _fill_user_totals(cursor)
+
+USER_TOTALS_SOURCE = """
+SELECT
+    user_id,
+    SUM(hours_worked) AS total_hours,
+    SUM(CASE WHEN is_verified THEN hours_worked ELSE 0 END) AS verified_hours,
+    MAX(service_date) AS last_service_date,
+    COUNT(*) AS entry_count
+FROM Service_Logs
+WHERE user_id IS NOT NULL
+GROUP BY user_id
+"""
+
+def _fill_user_totals(cursor):
+    cursor.execute("DELETE FROM User_Totals")
+    cursor.execute(
+        "INSERT INTO User_Totals (user_id, total_hours, verified_hours, last_service_date, entry_count) "
+        + USER_TOTALS_SOURCE
+    )
+
+def migrate_service_date_index(cursor):
+    """v4: date index for cross-user range filters (exports, aggregates)."""
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_service_logs_date
+    ON Service_Logs (service_date);
+    """)
+
+def migrate_report_state(cursor):
+    """v5: per-user high-water mark for incremental timesheets.
+
+    Triggers set `dirty` whenever a row already rendered into a report is
+    edited or deleted (or an agency is renamed), forcing a full rebuild.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Report_State (
+        user_id INTEGER PRIMARY KEY,
+        filename TEXT NOT NULL,
+        last_log_id INTEGER NOT NULL,
+        last_service_date DATE,
+        total_hours REAL NOT NULL,
+        body_end INTEGER NOT NULL,
+        full_name TEXT,
+        deadline_date DATE,
+        dirty BOOLEAN NOT NULL DEFAULT 0
+    );
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_service_logs_report_update
+    AFTER UPDATE ON Service_Logs
+    BEGIN
+        UPDATE Report_State SET dirty = 1
+        WHERE (user_id = OLD.user_id AND OLD.log_id <= last_log_id)
+           OR (user_id = NEW.user_id AND NEW.log_id <= last_log_id);
+    END;
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_service_logs_report_delete
+    AFTER DELETE ON Service_Logs
+    BEGIN
+        UPDATE Report_State SET dirty = 1
+        WHERE user_id = OLD.user_id AND OLD.log_id <= last_log_id;
+    END;
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_agencies_report_rename
+    AFTER UPDATE OF agency_name ON Agencies
+    BEGIN
+        UPDATE Report_State SET dirty = 1;
+    END;
+    """)
+
+def migrate_log_search(cursor):
+    """v6: FTS5 index over task descriptions and supervisor names.
+
+    External-content table, so the text is stored once (in Service_Logs)
+    and triggers keep the index in sync. Skipped with a warning when this
+    SQLite build lacks FTS5; --search then reports it as unavailable.
+    """
+    try:
+        cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS Service_Logs_FTS USING fts5(
+            task_description,
+            supervisor_name,
+            content='Service_Logs',
+            content_rowid='log_id'
+        );
+        """)
+    except sqlite3.OperationalError as exc:
+        print(f"⚠️ Full-text search disabled: {exc}")
+        return
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_service_logs_fts_insert
+    AFTER INSERT ON Service_Logs
+    BEGIN
+        INSERT INTO Service_Logs_FTS (rowid, task_description, supervisor_name)
+        VALUES (NEW.log_id, NEW.task_description, NEW.supervisor_name);
+    END;
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_service_logs_fts_delete
+    AFTER DELETE ON Service_Logs
+    BEGIN
+        INSERT INTO Service_Logs_FTS (Service_Logs_FTS, rowid, task_description, supervisor_name)
+        VALUES ('delete', OLD.log_id, OLD.task_description, OLD.supervisor_name);
+    END;
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_service_logs_fts_update
+    AFTER UPDATE OF task_description, supervisor_name ON Service_Logs
+    BEGIN
+        INSERT INTO Service_Logs_FTS (Service_Logs_FTS, rowid, task_description, supervisor_name)
+        VALUES ('delete', OLD.log_id, OLD.task_description, OLD.supervisor_name);
+        INSERT INTO Service_Logs_FTS (rowid, task_description, supervisor_name)
+        VALUES (NEW.log_id, NEW.task_description, NEW.supervisor_name);
+    END;
+    """)
+
+    cursor.execute("INSERT INTO Service_Logs_FTS (Service_Logs_FTS) VALUES ('rebuild')")
+
+def migrate_hours_rollup(cursor):
+    """v7: covering date index plus the opt-in daily Hours_Rollup.
+
+    Hours_Rollup holds hours per (day, user, agency) and is extended
+    incrementally from Rollup_State.last_log_id by refresh_rollup().
+    Inserts cost nothing extra; editing or deleting an already rolled-up
+    row marks the rollup dirty so the next refresh rebuilds it.
+    """
+    # Superset of idx_service_logs_date that also covers the aggregates.
+    cursor.execute("DROP INDEX IF EXISTS idx_service_logs_date")
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_service_logs_date_agency
+    ON Service_Logs (service_date, agency_id, user_id, hours_worked);
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Hours_Rollup (
+        bucket_day DATE NOT NULL,
+        user_id INTEGER NOT NULL,
+        agency_id INTEGER NOT NULL,
+        hours REAL NOT NULL,
+        entries INTEGER NOT NULL,
+        PRIMARY KEY (bucket_day, user_id, agency_id)
+    ) WITHOUT ROWID;
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Rollup_State (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        last_log_id INTEGER NOT NULL,
+        dirty BOOLEAN NOT NULL DEFAULT 0
+    );
+    """)
+    cursor.execute("INSERT OR IGNORE INTO Rollup_State (id, last_log_id, dirty) VALUES (1, 0, 0)")
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_service_logs_rollup_update
+    AFTER UPDATE OF user_id, agency_id, service_date, hours_worked ON Service_Logs
+    BEGIN
+        UPDATE Rollup_State SET dirty = 1 WHERE OLD.log_id <= last_log_id;
+    END;
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_service_logs_rollup_delete
+    AFTER DELETE ON Service_Logs
+    BEGIN
+        UPDATE Rollup_State SET dirty = 1 WHERE OLD.log_id <= last_log_id;
+    END;
+    """)
+
+def migrate_log_chain(cursor):
+    """v8: hash chain over Service_Logs plus verification checkpoints.
+
+    Log_Chain is append-only (triggers reject UPDATE/DELETE); existing
+    rows are sealed from the genesis hash.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Log_Chain (
+        log_id INTEGER PRIMARY KEY,
+        entry_hash BLOB NOT NULL
+    );
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Chain_Checkpoints (
+        log_id INTEGER PRIMARY KEY,
+        entry_hash BLOB NOT NULL,
+        rows_verified INTEGER NOT NULL,
+        verified_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+
+    for action in ("UPDATE", "DELETE"):
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_log_chain_no_{action.lower()}
+        BEFORE {action} ON Log_Chain
+        BEGIN
+            SELECT RAISE(ABORT, 'Log_Chain is append-only');
+        END;
+        """)
+
+    seal_chain(cursor)
+
+def migrate_merkle_tree(cursor):
+    """v9: Merkle tree over Log_Chain entry hashes.
+
+    Merkle_Leaves maps leaf index <-> log_id; Merkle_Nodes stores every
+    complete (power-of-two, aligned) subtree, so any root or inclusion
+    proof needs only O(log n) node lookups. Merkle_Roots records each
+    emitted (and signed) root.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Merkle_Leaves (
+        leaf_index INTEGER PRIMARY KEY,
+        log_id INTEGER NOT NULL UNIQUE,
+        hash BLOB NOT NULL
+    );
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Merkle_Nodes (
+        level INTEGER NOT NULL,
+        node_index INTEGER NOT NULL,
+        hash BLOB NOT NULL,
+        PRIMARY KEY (level, node_index)
+    ) WITHOUT ROWID;
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Merkle_Roots (
+        tree_size INTEGER NOT NULL,
+        root_hash BLOB NOT NULL,
+        signed_at DATETIME NOT NULL,
+        signature TEXT
+    );
+    """)
+
+    extend_merkle(cursor)
+
+def migrate_report_order_index(cursor):
+    """v10: adds log_id to the per-user index after service_date.
+
+    Reports order by (service_date, log_id); with log_id only implied at
+    the end of the old index, SQLite needed a temp B-tree to sort ties.
+    """
+    cursor.execute("DROP INDEX IF EXISTS idx_service_logs_user_date")
+    cursor.execute("""
+    CREATE INDEX idx_service_logs_user_date
+    ON Service_Logs (user_id, service_date, log_id, hours_worked, agency_id);
+    """)
+
+def migrate_log_verifications(cursor):
+    """v11: verification as its own append-only, hash-chained record.
+
+    Service_Logs.is_verified becomes derived state: inserting into
+    Log_Verifications sets it (trigger), and inserting an already verified
+    log records the entry for it. Verification_Chain seals the entries the
+    way Log_Chain seals logs, so flipping the flag directly leaves a log
+    whose flag disagrees with its latest sealed entry, which
+    verify_chain() reports. Existing verified logs are backfilled.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Log_Verifications (
+        verification_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        log_id INTEGER NOT NULL,
+        verified BOOLEAN NOT NULL,
+        verifier TEXT,
+        recorded_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (log_id) REFERENCES Service_Logs(log_id)
+    );
+    """)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_log_verifications_log
+    ON Log_Verifications (log_id, verification_id);
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Verification_Chain (
+        verification_id INTEGER PRIMARY KEY,
+        entry_hash BLOB NOT NULL
+    );
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Verification_Checkpoints (
+        verification_id INTEGER PRIMARY KEY,
+        entry_hash BLOB NOT NULL,
+        rows_verified INTEGER NOT NULL,
+        verified_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    """)
+
+    for table in ("Log_Verifications", "Verification_Chain"):
+        for action in ("UPDATE", "DELETE"):
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table.lower()}_no_{action.lower()}
+            BEFORE {action} ON {table}
+            BEGIN
+                SELECT RAISE(ABORT, '{table} is append-only');
+            END;
+            """)
+
+    cursor.execute("""
+    INSERT INTO Log_Verifications (log_id, verified, verifier)
+    SELECT log_id, 1, supervisor_name FROM Service_Logs WHERE is_verified ORDER BY log_id
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_service_logs_verified_insert
+    AFTER INSERT ON Service_Logs
+    WHEN NEW.is_verified
+    BEGIN
+        INSERT INTO Log_Verifications (log_id, verified, verifier)
+        VALUES (NEW.log_id, 1, NEW.supervisor_name);
+    END;
+    """)
+
+    cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS trg_log_verifications_apply
+    AFTER INSERT ON Log_Verifications
+    BEGIN
+        UPDATE Service_Logs SET is_verified = NEW.verified
+        WHERE log_id = NEW.log_id AND is_verified IS NOT NEW.verified;
+    END;
+    """)
+
+    seal_verifications(cursor)
+
+def migrate_issued_credentials(cursor):
+    """v12: one issued credential per user, so re-running the issuer is idempotent."""
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS Issued_Credentials (
+        user_id INTEGER PRIMARY KEY,
+        did TEXT NOT NULL UNIQUE,
+        hours_verified REAL NOT NULL,
+        entries INTEGER NOT NULL,
+        issued_at TEXT NOT NULL,
+        FOREIGN KEY (user_id) REFERENCES User_Profile(user_id)
+    );
+    """)
+
+# (version, migration) pairs; the last version is the current schema.
+MIGRATIONS = [
+    (1, migrate_base_schema),
+    (2, migrate_service_log_indexes),
+    (3, migrate_user_totals),
+    (4, migrate_service_date_index),
+    (5, migrate_report_state),
+    (6, migrate_log_search),
+    (7, migrate_hours_rollup),
+    (8, migrate_log_chain),
+    (9, migrate_merkle_tree),
+    (10, migrate_report_order_index),
+    (11, migrate_log_verifications),
+    (12, migrate_issued_credentials),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def setup_database():
+    """Checks if DB exists; if not, builds the schema and seeds data."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    # 0. Fast path: an initialised DB only needs this one header read.
+    cursor.execute("PRAGMA user_version")
+    current = cursor.fetchone()[0]
+    if current >= SCHEMA_VERSION:
+        return
+
+    # 1. Apply every migration newer than the stored version, in order.
+    for version, migrate in MIGRATIONS:
+        if version > current:
+            migrate(cursor)
+
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
-    conn.close()
+
+STATUS_QUERY = """
+SELECT 
+    u.total_hours_required AS Goal,
+    IFNULL(t.total_hours, 0) AS Completed,
+    (u.total_hours_required - IFNULL(t.total_hours, 0)) AS Remaining,
+    ROUND(julianday(u.deadline_date) - julianday('now'), 2) AS Days_Left
+FROM User_Profile u
+LEFT JOIN User_Totals t ON u.user_id = t.user_id
+WHERE u.user_id = ?
+"""
+
+ALL_STATUS_QUERY = """
+SELECT 
+    u.user_id,
+    u.full_name,
+    u.total_hours_required AS Goal,
+    IFNULL(t.total_hours, 0) AS Completed,
+    (u.total_hours_required - IFNULL(t.total_hours, 0)) AS Remaining,
+    ROUND(julianday(u.deadline_date) - julianday('now'), 2) AS Days_Left
+FROM User_Profile u
+LEFT JOIN User_Totals t ON u.user_id = t.user_id
+ORDER BY u.user_id
+"""
+
+REPORT_QUERY = """
+SELECT s.log_id, s.service_date, a.agency_name, s.hours_worked, s.task_description, s.is_verified
+FROM Service_Logs s
+JOIN Agencies a ON s.agency_id = a.agency_id
+WHERE s.user_id = ?
+ORDER BY s.service_date ASC, s.log_id ASC
+"""
+
+REPORT_NEW_ROWS_QUERY = """
+SELECT s.log_id, s.service_date, a.agency_name, s.hours_worked, s.task_description, s.is_verified
+FROM Service_Logs s
+JOIN Agencies a ON s.agency_id = a.agency_id
+WHERE s.user_id = ? AND s.log_id > ?
+ORDER BY s.service_date ASC, s.log_id ASC
+"""
+
+def user_exists(cursor, user_id):
+    cursor.execute("SELECT 1 FROM User_Profile WHERE user_id = ?", (user_id,))
+    return cursor.fetchone() is not None
+
+def fetch_status(cursor, user_id):
+    """Burn-rate numbers for one user as a dict, or None if no such user."""
+    cursor.execute(STATUS_QUERY, (user_id,))
+    result = cursor.fetchone()
+    if result is None:
+        return None
+    return {
+        "user_id": user_id,
+        "goal": result['Goal'],
+        "completed": result['Completed'],
+        "remaining": result['Remaining'],
+        "days_left": result['Days_Left'],
+        "burn_rate": burn_rate(result['Remaining'], result['Days_Left']),
+    }
 
 def show_status():
     conn = get_db_connection()
     cursor = conn.cursor()
     
     # The "Burn Rate" Logic
-    query = """
-    SELECT 
-        u.total_hours_required AS Goal,
-        IFNULL(SUM(s.hours_worked), 0) AS Completed,
-        (u.total_hours_required - IFNULL(SUM(s.hours_worked), 0)) AS Remaining,
-        ROUND(julianday(u.deadline_date) - julianday('now'), 2) AS Days_Left
-    FROM User_Profile u
-    LEFT JOIN Service_Logs s ON u.user_id = s.user_id
-    WHERE u.user_id = ?
-    """
-    
-    cursor.execute(query, (USER_ID,))
-    result = cursor.fetchone()
-    conn.close()
+    result = fetch_status(cursor, USER_ID)
 
     if result:
-        goal = result['Goal']
-        done = result['Completed']
-        left = result['Remaining']
-        days = result['Days_Left']
-        
-        # Avoid division by zero if deadline passed
-        if days > 0:
-            rate = round(left / days, 1)
-        else:
-            rate = "CRITICAL (Deadline Passed)"
-
         print(f"\n--- 🚨 STATUS REPORT ---")
-        print(f"Goal:      {goal} hrs")
-        print(f"Completed: {done} hrs")
-        print(f"Remaining: {left} hrs")
-        print(f"Days Left: {days}")
-        print(f"BURN RATE: {rate} hrs/day needed")
+        print(f"Goal:      {result['goal']} hrs")
+        print(f"Completed: {result['completed']} hrs")
+        print(f"Remaining: {result['remaining']} hrs")
+        print(f"Days Left: {result['days_left']}")
+        print(f"BURN RATE: {result['burn_rate']} hrs/day needed")
         print("------------------------\n")
+    else:
+        print(f"❌ Unknown user {USER_ID}.")
+
+def burn_rate(left, days):
+    # Avoid division by zero if deadline passed
+    if days > 0:
+        return round(left / days, 1)
+    return "CRITICAL (Deadline Passed)"
+
+def show_all_status(fmt="table"):
+    """Burn-rate status for every user from one pass over User_Profile."""
+    cursor = get_db_connection().cursor()
+    cursor.execute(ALL_STATUS_QUERY)
+
+    columns = ["user_id", "full_name", "goal", "completed", "remaining", "days_left", "burn_rate"]
+    if fmt == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(columns)
+    else:
+        print(f"\n{'ID':>6} | {'NAME':<24} | {'GOAL':>7} | {'DONE':>7} | {'LEFT':>7} | {'DAYS':>8} | BURN RATE")
+        print("-" * 90)
+
+    count = 0
+    for row in cursor:
+        rate = burn_rate(row['Remaining'], row['Days_Left'])
+        if fmt == "csv":
+            writer.writerow([row['user_id'], row['full_name'], row['Goal'], row['Completed'],
+                             row['Remaining'], row['Days_Left'], rate])
+        else:
+            print(f"{row['user_id']:>6} | {row['full_name'][:24]:<24} | {row['Goal']:>7} | {row['Completed']:>7} | "
+                  f"{row['Remaining']:>7} | {row['Days_Left']:>8} | {rate}")
+        count += 1
+
+    if fmt != "csv":
+        print("-" * 90)
+        print(f"{count} users\n")
+    return count
+
+class AgencyCache:
+    """In-process copy of Agencies for lookups and name search.
+
+    Loaded once per connection and reloaded only when PRAGMA data_version
+    shows another connection has committed since the last load. Call
+    invalidate() after changing Agencies through the same connection.
+
+    Pass `conn` to give the cache a dedicated connection (opened with
+    check_same_thread=False); it can then be shared between threads, and
+    every write through any other connection is noticed.
+    """
+
+    def __init__(self, conn=None):
+        self._source = conn
+        self._conn = None
+        self._version = None
+        self._lock = threading.Lock()
+        self.by_id = {}
+        self._names = []  # sorted (casefolded name, agency_id)
+
+    def _refresh(self):
+        with self._lock:
+            conn = self._source or get_db_connection()
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if conn is self._conn and version == self._version:
+                return
+            rows = conn.execute("SELECT agency_id, agency_name, category FROM Agencies ORDER BY agency_id").fetchall()
+            self.by_id = {row['agency_id']: row for row in rows}
+            self._names = sorted((row['agency_name'].casefold(), row['agency_id']) for row in rows)
+            self._conn, self._version = conn, version
+
+    def invalidate(self):
+        self._conn = None
+
+    def all(self):
+        self._refresh()
+        return list(self.by_id.values())
+
+    def get(self, agency_id):
+        self._refresh()
+        return self.by_id.get(agency_id)
+
+    def search(self, text, limit=AGENCY_LIST_LIMIT):
+        """Prefix matches first, then substring, then fuzzy matches."""
+        self._refresh()
+        needle = text.strip().casefold()
+        if not needle:
+            return list(self.by_id.values())[:limit]
+
+        ids = []
+        i = bisect.bisect_left(self._names, (needle,))
+        while i < len(self._names) and self._names[i][0].startswith(needle) and len(ids) < limit:
+            ids.append(self._names[i][1])
+            i += 1
+        if len(ids) < limit:
+            seen = set(ids)
+            ids.extend(
+                agency_id for name, agency_id in self._names
+                if needle in name and agency_id not in seen
+            )
+            ids = ids[:limit]
+        if not ids:
+            # Fuzzy: compare against the whole name and each word of it.
+            ids = [
+                agency_id for name, agency_id in self._names
+                if get_close_matches(needle, [name] + name.split(), n=1, cutoff=0.75)
+            ][:limit]
+        return [self.by_id[agency_id] for agency_id in ids]
+
+AGENCY_CACHE = AgencyCache()
 
 def log_hours():
     print("\n--- 📝 LOG HOURS ---")
     conn = get_db_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT agency_id, agency_name FROM Agencies")
-    agencies = cursor.fetchall()
-    
-    for agency in agencies:
+
+    query = input("Search agencies (name, or Enter to list): ")
+    matches = AGENCY_CACHE.search(query)
+    for agency in matches:
         print(f"[{agency['agency_id']}] {agency['agency_name']}")
+    if not matches:
+        print("No matching agencies.")
+    elif len(matches) == AGENCY_LIST_LIMIT:
+        print(f"(showing first {AGENCY_LIST_LIMIT}; refine the search to narrow down)")
     
     try:
         agency_id = int(input("Enter Agency ID: "))
+        if AGENCY_CACHE.get(agency_id) is None:
+            print(f"❌ Unknown agency ID {agency_id}.")
+            return
         hours = float(input("Hours Worked: "))
         desc = input("Task Description: ")
         date = input("Date (YYYY-MM-DD) [Press Enter for Today]: ")
@@ -142,14 +1070,13 @@ def log_hours():
             INSERT INTO Service_Logs (user_id, agency_id, service_date, hours_worked, task_description, is_verified)
             VALUES (?, ?, ?, ?, ?, 0)
         """, (USER_ID, agency_id, date, hours, desc))
+        seal_log_entries(cursor)
         
         conn.commit()
         print("✅ Hours logged successfully!")
         
     except ValueError:
         print("❌ Invalid input. Please enter numbers.")
-    finally:
-        conn.close()
 
 def log_hours_entry(agency_id, hours, desc, date=None):
     conn = get_db_connection()
@@ -162,95 +1089,1609 @@ def log_hours_entry(agency_id, hours, desc, date=None):
         INSERT INTO Service_Logs (user_id, agency_id, service_date, hours_worked, task_description, is_verified)
         VALUES (?, ?, ?, ?, ?, 0)
     """, (USER_ID, agency_id, date, hours, desc))
+    seal_log_entries(cursor)
 
     conn.commit()
-    conn.close()
 
-def generate_report():
-    print("\n--- 🖨️ GENERATING COMPLIANCE REPORT ---")
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT * FROM User_Profile WHERE user_id = ?", (USER_ID,))
-    user = cursor.fetchone()
-    
-    query = """
-    SELECT s.service_date, a.agency_name, s.hours_worked, s.task_description, s.is_verified
-    FROM Service_Logs s
-    JOIN Agencies a ON s.agency_id = a.agency_id
-    WHERE s.user_id = ?
-    ORDER BY s.service_date ASC
+class LogWriteQueue:
+    """Single-writer queue that group-commits log submissions.
+
+    Producers (threads, or async tasks via submit_async) call submit() with
+    (user_id, agency_id, service_date, hours_worked, task_description).
+    One writer thread drains the queue into batches of up to `max_batch`
+    rows or `max_delay` seconds, inserts each batch with executemany in one
+    transaction, and only then resolves each submission's Future with its
+    log_id. A failed batch is retried one row per transaction, so only the
+    submissions that fail on their own get the exception.
     """
-    cursor.execute(query, (USER_ID,))
-    logs = cursor.fetchall()
-    conn.close()
-
-    # Build Report
-    report_lines = []
-    report_lines.append("="*60)
-    report_lines.append(f"COMMUNITY SERVICE TIMESHEET: {user['full_name']}")
-    report_lines.append(f"DEADLINE: {user['deadline_date']}")
-    report_lines.append(f"GENERATED: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    report_lines.append("="*60)
-    report_lines.append(f"{'DATE':<12} | {'AGENCY':<20} | {'HRS':<5} | {'TASK'}")
-    report_lines.append("-" * 60)
-    
-    total_hours = 0
-    for log in logs:
-        status = "✅" if log['is_verified'] else "⚠️"
-        line = f"{log['service_date']:<12} | {log['agency_name']:<20} | {log['hours_worked']:<5} | {log['task_description']} {status}"
-        report_lines.append(line)
-        total_hours += log['hours_worked']
-        
-    report_lines.append("-" * 60)
-    report_lines.append(f"TOTAL HOURS COMPLETED: {total_hours}")
-    report_lines.append(f"HOURS REMAINING:       {user['total_hours_required'] - total_hours}")
-    report_lines.append("="*60)
-    report_lines.append("\n\n______________________________          ______________________________")
-    report_lines.append("Supervisor Signature                    Date")
-
-    report_content = "\n".join(report_lines)
-    print(report_content)
-    
-    filename = f"Timesheet_{datetime.now().strftime('%Y%m%d')}.txt"
-    with open(filename, "w") as f:
-        f.write(report_content)
-    print(f"\n[💾 Saved to {filename}]")
 
-def parse_log_entry(entry):
-    parts = [part.strip() for part in entry.split("|")]
-    if len(parts) < 3 or len(parts) > 4:
-        raise ValueError("Log entry must be: agency_id|hours|description|date(optional)")
+    def __init__(self, max_batch=WRITE_QUEUE_BATCH, max_delay=WRITE_QUEUE_DELAY):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.SimpleQueue()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.batches = 0
+        self.rows = 0
+        self._thread.start()
+
+    def submit(self, user_id, agency_id, service_date, hours, desc):
+        """Queues one entry; the returned Future resolves to its log_id once durable."""
+        if self._stopping.is_set():
+            raise RuntimeError("LogWriteQueue is closed")
+        future = Future()
+        self._queue.put(((user_id, agency_id, service_date, hours, desc), future))
+        return future
+
+    async def submit_async(self, *record):
+        return await asyncio.wrap_future(self.submit(*record))
+
+    def close(self):
+        """Flushes everything queued so far and stops the writer thread."""
+        self._stopping.set()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _next_batch(self):
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # let the outer loop see the stop marker
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        conn = open_db_connection()
+        try:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    break
+                self._commit(conn, batch)
+        finally:
+            conn.close()
+
+    def _commit(self, conn, batch):
+        try:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO Service_Logs (user_id, agency_id, service_date, hours_worked, task_description, is_verified)
+                VALUES (?, ?, ?, ?, ?, 0)
+            """, [record for record, _ in batch])
+            # The batch holds the write lock, so its AUTOINCREMENT ids are
+            # consecutive and end at last_insert_rowid().
+            cursor.execute("SELECT last_insert_rowid()")
+            first_id = cursor.fetchone()[0] - len(batch) + 1
+            seal_log_entries(cursor)
+            conn.commit()
+        except Exception as exc:
+            conn.rollback()
+            if len(batch) > 1:
+                for item in batch:
+                    self._commit(conn, [item])
+            else:
+                batch[0][1].set_exception(exc)
+            return
+        self.batches += 1
+        self.rows += len(batch)
+        for offset, (_, future) in enumerate(batch):
+            future.set_result(first_id + offset)
+
+def iter_log_file(path):
+    """Yields parsed entries from a pipe-delimited file ('-' reads stdin)."""
+    handle = sys.stdin if path == '-' else open(path, encoding="utf-8")
+    try:
+        for line_no, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                yield parse_log_entry(line)
+            except ValueError as exc:
+                raise ValueError(f"{path}:{line_no}: {exc}") from None
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+def log_hours_bulk(entries, batch_size=BULK_BATCH_SIZE):
+    """Inserts many parsed entries with executemany inside one transaction."""
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1")
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    total = 0
+
+    try:
+        rows = ((USER_ID, agency_id, hours, desc, date or today) for agency_id, hours, desc, date in entries)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            cursor.executemany("""
+                INSERT INTO Service_Logs (user_id, agency_id, hours_worked, task_description, service_date, is_verified)
+                VALUES (?, ?, ?, ?, ?, 0)
+            """, batch)
+            total += len(batch)
+        seal_log_entries(cursor)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else float(total)
+    print(f"✅ Logged {total} entries in {elapsed:.3f}s ({rate:,.0f} rows/sec)")
+    return total
+
+def parse_hours(value):
+    """Hours worked as a float; NaN, infinite, zero and negative are rejected."""
+    hours = float(value)
+    if not math.isfinite(hours) or hours <= 0:
+        raise ValueError(f"hours_worked must be a positive number: {value}")
+    return hours
+
+def log_hours_checked(entries, batch_size=BULK_BATCH_SIZE):
+    """--log/--log-file: like log_hours_bulk, but a bad entry exits with ❌.
+
+    The run is one transaction, so nothing is logged; the message carries
+    the path:line that iter_log_file() attaches to parse errors.
+    """
+    try:
+        return log_hours_bulk(entries, batch_size)
+    except (ValueError, sqlite3.IntegrityError) as exc:
+        print(f"❌ {exc} (nothing was logged)")
+        sys.exit(1)
+
+IMPORT_FIELDS = (
+    "user_id", "agency_id", "agency_name", "service_date",
+    "hours_worked", "task_description", "supervisor_name", "is_verified",
+)
+TRUE_VALUES = {"1", "true", "yes", "y", "t", "verified"}
+
+def parse_column_map(pairs):
+    """Turns ['field=CSV Column', ...] into {field: column}."""
+    mapping = {}
+    for pair in pairs or ():
+        field, sep, column = pair.partition("=")
+        field = field.strip()
+        if not sep or field not in IMPORT_FIELDS:
+            raise ValueError(f"Column mapping must be field=column with field in {', '.join(IMPORT_FIELDS)}: {pair}")
+        mapping[field] = column.strip()
+    return mapping
+
+def import_csv(path, column_map=None, batch_size=BULK_BATCH_SIZE, rejects_path=None):
+    """Bulk-loads historical logs from a CSV in chunked transactions.
+
+    Agency names and user ids are resolved through lookups built once
+    from Agencies and User_Profile.
+    Rows that fail validation are written, with the reason, to
+    `rejects_path` (default <path>.rejects.csv) instead of aborting.
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1")
+    columns = {field: field for field in IMPORT_FIELDS}
+    columns.update(column_map or {})
+    rejects_path = rejects_path or f"{path}.rejects.csv"
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT agency_id, agency_name FROM Agencies")
+    agencies_by_name = {}
+    agency_ids = set()
+    for row in cursor.fetchall():
+        agencies_by_name.setdefault(row['agency_name'].strip().casefold(), row['agency_id'])
+        agency_ids.add(row['agency_id'])
+    cursor.execute("SELECT user_id FROM User_Profile")
+    user_ids = {row['user_id'] for row in cursor.fetchall()}
+
+    def convert(record):
+        user_id = int(record.get(columns["user_id"]) or USER_ID)
+        if user_id not in user_ids:
+            raise ValueError(f"unknown user_id {user_id}")
+        agency_id = record.get(columns["agency_id"])
+        if agency_id:
+            agency_id = int(agency_id)
+            if agency_id not in agency_ids:
+                raise ValueError(f"unknown agency_id {agency_id}")
+        else:
+            name = (record.get(columns["agency_name"]) or "").strip()
+            try:
+                agency_id = agencies_by_name[name.casefold()]
+            except KeyError:
+                raise ValueError(f"unknown agency {name!r}") from None
+        service_date = datetime.strptime((record.get(columns["service_date"]) or "").strip(), "%Y-%m-%d")
+        hours = parse_hours(record.get(columns["hours_worked"]) or "")
+        verified = (record.get(columns["is_verified"]) or "").strip().lower() in TRUE_VALUES
+        return (
+            user_id,
+            agency_id,
+            service_date.strftime("%Y-%m-%d"),
+            hours,
+            record.get(columns["task_description"]),
+            record.get(columns["supervisor_name"]) or None,
+            int(verified),
+        )
+
+    start = time.perf_counter()
+    imported = rejected = 0
+    with open(path, newline="", encoding="utf-8-sig") as src, \
+            open(rejects_path, "w", newline="", encoding="utf-8") as rej:
+        reader = csv.DictReader(src)
+        reject_writer = None
+        numbered = enumerate(reader, 2)  # header is line 1
+        while True:
+            chunk = list(islice(numbered, batch_size))
+            if not chunk:
+                break
+            good = []
+            for line_no, record in chunk:
+                try:
+                    good.append(convert(record))
+                except (TypeError, ValueError) as exc:
+                    if reject_writer is None:
+                        reject_writer = csv.writer(rej)
+                        reject_writer.writerow(["line", "error"] + reader.fieldnames)
+                    reject_writer.writerow([line_no, str(exc)] + [record.get(f) for f in reader.fieldnames])
+                    rejected += 1
+            try:
+                cursor.executemany("""
+                    INSERT INTO Service_Logs (user_id, agency_id, service_date, hours_worked, task_description, supervisor_name, is_verified)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, good)
+                seal_log_entries(cursor)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            imported += len(good)
+
+    if not rejected:
+        os.remove(rejects_path)
+    elapsed = time.perf_counter() - start
+    rate = imported / elapsed if elapsed > 0 else float(imported)
+    print(f"✅ Imported {imported} rows in {elapsed:.3f}s ({rate:,.0f} rows/sec)")
+    if rejected:
+        print(f"⚠️ Rejected {rejected} rows; see {rejects_path}")
+    return imported, rejected
+
+def generate_report(echo=True, incremental=False):
+    print("\n--- 🖨️ GENERATING COMPLIANCE REPORT ---")
+    if incremental:
+        return generate_incremental_report(echo)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT * FROM User_Profile WHERE user_id = ?", (USER_ID,))
+    user = cursor.fetchone()
+    if user is None:
+        print(f"❌ Unknown user {USER_ID}.")
+        return
+    
+    cursor.execute(REPORT_QUERY, (USER_ID,))
+
+    filename = f"Timesheet_{datetime.now().strftime('%Y%m%d')}.txt"
+    with open(filename, "w", encoding="utf-8", buffering=REPORT_BUFFER_SIZE) as f:
+        streams = [f, sys.stdout] if echo else [f]
+        write_report(user, cursor, streams)
+    print(f"\n[💾 Saved to {filename}]")
+
+_worker_local = threading.local()
+
+def _render_user_report(db_name, user_id, out_dir, stamp):
+    """Pool worker: renders one user's timesheet on a read-only connection."""
+    conn = getattr(_worker_local, 'conn', None)
+    if conn is None:
+        conn = _worker_local.conn = open_readonly_connection(db_name)
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM User_Profile WHERE user_id = ?", (user_id,))
+    user = cursor.fetchone()
+    cursor.execute(REPORT_QUERY, (user_id,))
+
+    filename = os.path.join(out_dir, f"Timesheet_{user_id}_{stamp}.txt")
+    with open(filename, "w", encoding="utf-8", buffering=REPORT_BUFFER_SIZE) as f:
+        write_report(user, cursor, [f])
+    return filename
+
+def generate_all_reports(out_dir=".", workers=REPORT_WORKERS, executor="thread"):
+    """Renders one timesheet per user across a thread or process pool."""
+    print("\n--- 🖨️ GENERATING COMPLIANCE REPORTS (ALL USERS) ---")
+    os.makedirs(out_dir, exist_ok=True)
+    cursor = get_db_connection().cursor()
+    cursor.execute("SELECT user_id FROM User_Profile ORDER BY user_id")
+    user_ids = [row['user_id'] for row in cursor.fetchall()]
+
+    stamp = datetime.now().strftime('%Y%m%d')
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    start = time.perf_counter()
+    failures = 0
+    with pool_class(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_render_user_report, DB_NAME, user_id, out_dir, stamp): user_id
+            for user_id in user_ids
+        }
+        for future, user_id in futures.items():
+            try:
+                future.result()
+            except Exception as exc:
+                failures += 1
+                print(f"❌ User {user_id}: {exc}")
+
+    elapsed = time.perf_counter() - start
+    done = len(user_ids) - failures
+    rate = done / elapsed if elapsed > 0 else float(done)
+    print(f"✅ Wrote {done} reports to {out_dir} in {elapsed:.3f}s "
+          f"({rate:,.1f} reports/sec, {workers} {executor} workers)")
+    return done
+
+class ReportWriter:
+    """Writes timesheet sections to every stream in `streams`.
+
+    Lines are buffered and flushed in chunks of REPORT_CHUNK_LINES.
+    """
+
+    GENERATED_FORMAT = "GENERATED: %Y-%m-%d %H:%M"  # fixed width, so restamp() can overwrite it
+
+    def __init__(self, streams):
+        self.streams = streams
+        self._chunk = []
+
+    def emit(self, line):
+        self._chunk.append(line)
+        if len(self._chunk) >= REPORT_CHUNK_LINES:
+            self.flush()
+
+    def flush(self):
+        if self._chunk:
+            text = "\n".join(self._chunk) + "\n"
+            for stream in self.streams:
+                stream.write(text)
+            self._chunk.clear()
+
+    def header(self, user):
+        self.emit("="*60)
+        self.emit(f"COMMUNITY SERVICE TIMESHEET: {user['full_name']}")
+        self.emit(f"DEADLINE: {user['deadline_date']}")
+        self.emit(datetime.now().strftime(self.GENERATED_FORMAT))
+        self.emit("="*60)
+        self.emit(f"{'DATE':<12} | {'AGENCY':<20} | {'HRS':<5} | {'TASK'}")
+        self.emit("-" * 60)
+
+    def entries(self, logs):
+        """Writes one line per log; returns (hours, max log_id, max date)."""
+        total_hours = 0
+        last_log_id = 0
+        last_date = None
+        for log in logs:
+            status = "✅" if log['is_verified'] else "⚠️"
+            self.emit(f"{log['service_date']:<12} | {log['agency_name']:<20} | {log['hours_worked']:<5} | {log['task_description']} {status}")
+            total_hours += log['hours_worked']
+            last_log_id = max(last_log_id, log['log_id'])
+            last_date = log['service_date']
+        return total_hours, last_log_id, last_date
+
+    def footer(self, user, total_hours):
+        self.emit("-" * 60)
+        self.emit(f"TOTAL HOURS COMPLETED: {total_hours}")
+        self.emit(f"HOURS REMAINING:       {user['total_hours_required'] - total_hours}")
+        self.emit("="*60)
+        self.emit("\n\n______________________________          ______________________________")
+        self.emit("Supervisor Signature                    Date")
+        self.flush()
+
+    @classmethod
+    def restamp(cls, path):
+        """Rewrites the GENERATED line of an existing report in place.
+
+        Returns False when the header has no such line.
+        """
+        line = datetime.now().strftime(cls.GENERATED_FORMAT).encode("utf-8")
+        with open(path, "r+b") as f:
+            head = f.read(1 << 12)  # the header is a handful of short lines
+            pos = head.find(b"\n" + line[:len("GENERATED: ")])
+            if pos < 0:
+                return False
+            f.seek(pos + 1)
+            f.write(line)
+        return True
+
+def write_report(user, logs, streams):
+    """Streams a timesheet for `user` to every stream in `streams`.
+
+    `logs` is any iterable of report rows (normally the live cursor), so
+    memory stays flat no matter how many entries the user has. Returns the
+    total hours.
+    """
+    writer = ReportWriter(streams)
+    writer.header(user)
+    total_hours, _, _ = writer.entries(logs)
+    writer.footer(user, total_hours)
+    return total_hours
+
+def generate_incremental_report(echo=True):
+    """Appends only entries logged since the last run to Timesheet_<user>.txt.
+
+    Falls back to a full rebuild when there is no previous report, when a
+    rendered row was edited or deleted, when the profile header changed, or
+    when a new entry is dated before the last rendered one (appending it
+    would break date order).
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM User_Profile WHERE user_id = ?", (USER_ID,))
+    user = cursor.fetchone()
+    if user is None:
+        print(f"❌ Unknown user {USER_ID}.")
+        return
+    cursor.execute("SELECT * FROM Report_State WHERE user_id = ?", (USER_ID,))
+    state = cursor.fetchone()
+    filename = f"Timesheet_{USER_ID}.txt"
+
+    reason = None
+    if state is None:
+        reason = "no previous report"
+    elif state['dirty']:
+        reason = "rendered entries changed"
+    elif state['filename'] != filename or not os.path.exists(filename):
+        reason = "previous report missing"
+    elif (state['full_name'], state['deadline_date']) != (user['full_name'], user['deadline_date']):
+        reason = "profile changed"
+    else:
+        cursor.execute(
+            "SELECT MIN(service_date) FROM Service_Logs WHERE user_id = ? AND log_id > ?",
+            (USER_ID, state['last_log_id']),
+        )
+        earliest_new = cursor.fetchone()[0]
+        if earliest_new is not None and state['last_service_date'] and earliest_new < state['last_service_date']:
+            reason = "backdated entries"
+    if reason is None and not ReportWriter.restamp(filename):
+        reason = "report header not found"
+
+    if reason:
+        print(f"🔄 Full rebuild ({reason})")
+        cursor.execute(REPORT_QUERY, (USER_ID,))
+        with open(filename, "w", encoding="utf-8", buffering=REPORT_BUFFER_SIZE) as f:
+            writer = ReportWriter([f, sys.stdout] if echo else [f])
+            writer.header(user)
+            total_hours, last_log_id, last_date = writer.entries(cursor)
+            writer.flush()
+            body_end = f.tell()
+            writer.footer(user, total_hours)
+        added = None
+    else:
+        cursor.execute(REPORT_NEW_ROWS_QUERY, (USER_ID, state['last_log_id']))
+        with open(filename, "r+", encoding="utf-8") as f:
+            f.seek(state['body_end'])
+            f.truncate()
+            writer = ReportWriter([f, sys.stdout] if echo else [f])
+            added_hours, last_log_id, last_date = writer.entries(cursor)
+            writer.flush()
+            body_end = f.tell()
+            total_hours = state['total_hours'] + added_hours
+            writer.footer(user, total_hours)
+        added = last_log_id
+        last_log_id = max(last_log_id, state['last_log_id'])
+        last_date = last_date or state['last_service_date']
+
+    cursor.execute("""
+        INSERT OR REPLACE INTO Report_State
+            (user_id, filename, last_log_id, last_service_date, total_hours, body_end, full_name, deadline_date, dirty)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)
+    """, (USER_ID, filename, last_log_id, last_date, total_hours, body_end, user['full_name'], user['deadline_date']))
+    conn.commit()
+
+    if added is not None:
+        print(f"➕ Appended entries up to log {last_log_id}" if added else "✅ No new entries")
+    print(f"\n[💾 Saved to {filename}]")
+
+def rebuild_user_totals():
+    """Recomputes User_Totals from Service_Logs and reports any drift."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT * FROM User_Totals")
+    before = {row['user_id']: row for row in cursor.fetchall()}
+    cursor.execute(USER_TOTALS_SOURCE)
+    fresh = {row['user_id']: row for row in cursor.fetchall()}
+
+    mismatches = 0
+    for user_id in sorted(set(before) | set(fresh)):
+        old, new = before.get(user_id), fresh.get(user_id)
+        if new is None and old['entry_count'] == 0:
+            continue
+        if old is None or new is None or _totals_differ(old, new):
+            mismatches += 1
+            print(f"⚠️ User {user_id}: stored {_format_totals(old)} != actual {_format_totals(new)}")
+
+    _fill_user_totals(cursor)
+    conn.commit()
+
+    if mismatches:
+        print(f"🔧 Rebuilt totals for {len(fresh)} users ({mismatches} corrected).")
+    else:
+        print(f"✅ Rebuilt totals for {len(fresh)} users; all were consistent.")
+    return mismatches
+
+def _totals_differ(a, b):
+    return (
+        abs(a['total_hours'] - b['total_hours']) > 1e-6
+        or abs(a['verified_hours'] - b['verified_hours']) > 1e-6
+        or a['last_service_date'] != b['last_service_date']
+        or a['entry_count'] != b['entry_count']
+    )
+
+def _format_totals(row):
+    if row is None:
+        return "(missing)"
+    return f"{row['total_hours']}h/{row['verified_hours']}h verified/{row['entry_count']} entries/last {row['last_service_date']}"
+
+EXPORT_COLUMNS = [
+    "log_id", "user_id", "agency_id", "agency_name", "category", "service_date",
+    "hours_worked", "task_description", "supervisor_name", "is_verified",
+]
+
+EXPORT_OPENERS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+
+def open_export(path):
+    """Opens an export target for text writing; compression follows the extension."""
+    if path == '-':
+        return sys.stdout
+    opener = EXPORT_OPENERS.get(os.path.splitext(path)[1].lower(), open)
+    return opener(path, "wt", encoding="utf-8", newline="")
+
+def export_logs(path, fmt="csv", since=None, until=None, user_id=None):
+    """Streams Service_Logs joined with Agencies to CSV or NDJSON."""
+    clauses, params = [], []
+    if user_id is not None:
+        clauses.append("s.user_id = ?")
+        params.append(user_id)
+    if since:
+        clauses.append("s.service_date >= ?")
+        params.append(since)
+    if until:
+        clauses.append("s.service_date <= ?")
+        params.append(until)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    cursor = get_db_connection().cursor()
+    cursor.arraysize = EXPORT_FETCH_SIZE
+    cursor.execute(f"""
+        SELECT s.log_id, s.user_id, s.agency_id, a.agency_name, a.category, s.service_date,
+               s.hours_worked, s.task_description, s.supervisor_name, s.is_verified
+        FROM Service_Logs s
+        LEFT JOIN Agencies a ON s.agency_id = a.agency_id
+        {where}
+        ORDER BY s.log_id
+    """, params)
+
+    start = time.perf_counter()
+    count = 0
+    out = open_export(path)
+    try:
+        if fmt == "ndjson":
+            encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                out.write("".join(encode(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in rows))
+                count += len(rows)
+        else:
+            writer = csv.writer(out)
+            writer.writerow(EXPORT_COLUMNS)
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
+                writer.writerows(rows)
+                count += len(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    if path != '-':
+        rate = count / elapsed if elapsed > 0 else float(count)
+        print(f"✅ Exported {count} rows to {path} in {elapsed:.3f}s ({rate:,.0f} rows/sec)")
+    return count
+
+def search_logs(text, page=1, page_size=SEARCH_PAGE_SIZE, user_id=None):
+    """Ranked full-text search over task descriptions and supervisor names."""
+    cursor = get_db_connection().cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'Service_Logs_FTS'")
+    if cursor.fetchone() is None:
+        print("❌ Full-text search is not available (SQLite built without FTS5).")
+        return []
+
+    page = max(page, 1)
+    user_filter = "AND s.user_id = ?" if user_id is not None else ""
+    params = [text] + ([user_id] if user_id is not None else []) + [page_size, (page - 1) * page_size]
+    try:
+        cursor.execute(f"""
+            SELECT s.log_id, s.user_id, s.service_date, a.agency_name, s.hours_worked,
+                   snippet(Service_Logs_FTS, -1, '[', ']', '…', 12) AS excerpt
+            FROM Service_Logs_FTS f
+            JOIN Service_Logs s ON s.log_id = f.rowid
+            LEFT JOIN Agencies a ON a.agency_id = s.agency_id
+            WHERE Service_Logs_FTS MATCH ? {user_filter}
+            ORDER BY f.rank
+            LIMIT ? OFFSET ?
+        """, params)
+        results = cursor.fetchall()
+    except sqlite3.OperationalError as exc:
+        print(f"❌ Invalid search query: {exc}")
+        return []
+
+    print(f"\n--- 🔎 SEARCH: {text} (page {page}) ---")
+    for row in results:
+        print(f"#{row['log_id']:<8} user {row['user_id']:<6} {row['service_date']:<12} "
+              f"{row['agency_name'] or '?':<20} {row['hours_worked']:>5}h  {row['excerpt']}")
+    if not results:
+        print("No matches.")
+    elif len(results) == page_size:
+        print(f"(more results may follow; use --page {page + 1})")
+    return results
+
+AGGREGATE_BUCKETS = {
+    "day": "{col}",
+    "week": "date({col}, 'weekday 0', '-6 days')",  # Monday of that week
+    "month": "strftime('%Y-%m-01', {col})",
+}
+
+# group -> (id expression, label expression)
+AGGREGATE_GROUPS = {
+    "agency": ("{src}.agency_id", "IFNULL(a.agency_name, '(unknown)')"),
+    "category": ("IFNULL(a.category, '(none)')", "IFNULL(a.category, '(none)')"),
+    "user": ("{src}.user_id", "IFNULL(u.full_name, 'User ' || {src}.user_id)"),
+}
+
+def refresh_rollup():
+    """Brings Hours_Rollup up to date; returns the number of new logs folded in."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT last_log_id, dirty FROM Rollup_State WHERE id = 1")
+    last_log_id, dirty = cursor.fetchone()
+    if dirty:
+        cursor.execute("DELETE FROM Hours_Rollup")
+        last_log_id = 0
+
+    cursor.execute("SELECT IFNULL(MAX(log_id), 0) FROM Service_Logs")
+    high_water = cursor.fetchone()[0]
+    if high_water <= last_log_id and not dirty:
+        return 0
+
+    cursor.execute("""
+        INSERT INTO Hours_Rollup (bucket_day, user_id, agency_id, hours, entries)
+        SELECT service_date, user_id, agency_id, SUM(hours_worked), COUNT(*)
+        FROM Service_Logs
+        WHERE log_id > ? AND log_id <= ? AND user_id IS NOT NULL AND agency_id IS NOT NULL
+        GROUP BY service_date, user_id, agency_id
+        ON CONFLICT (bucket_day, user_id, agency_id) DO UPDATE SET
+            hours = hours + excluded.hours,
+            entries = entries + excluded.entries
+    """, (last_log_id, high_water))
+    folded = high_water - last_log_id
+    cursor.execute("UPDATE Rollup_State SET last_log_id = ?, dirty = 0 WHERE id = 1", (high_water,))
+    conn.commit()
+    return folded
+
+def aggregate_hours(granularity="week", group="agency", since=None, until=None, fmt="table", use_rollup=False):
+    """Hours per time bucket and group, computed entirely in SQL."""
+    if use_rollup:
+        refresh_rollup()
+        src, date_col, hours, entries = "r", "r.bucket_day", "SUM(r.hours)", "SUM(r.entries)"
+        table = "Hours_Rollup r"
+    else:
+        src, date_col, hours, entries = "s", "s.service_date", "SUM(s.hours_worked)", "COUNT(*)"
+        table = "Service_Logs s"
+
+    bucket = AGGREGATE_BUCKETS[granularity].format(col=date_col)
+    group_id, label = (expr.format(src=src) for expr in AGGREGATE_GROUPS[group])
+    clauses, params = [], []
+    if since:
+        clauses.append(f"{date_col} >= ?")
+        params.append(since)
+    if until:
+        clauses.append(f"{date_col} <= ?")
+        params.append(until)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    cursor = get_db_connection().cursor()
+    cursor.execute(f"""
+        SELECT {bucket} AS bucket, {label} AS label, {hours} AS hours, {entries} AS entries
+        FROM {table}
+        LEFT JOIN Agencies a ON a.agency_id = {src}.agency_id
+        LEFT JOIN User_Profile u ON u.user_id = {src}.user_id
+        {where}
+        GROUP BY bucket, {group_id}
+        ORDER BY bucket, label
+    """, params)
+
+    if fmt == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow([granularity, group, "hours", "entries"])
+        for row in cursor:
+            writer.writerow([row['bucket'], row['label'], row['hours'], row['entries']])
+        return
+
+    print(f"\n--- 📊 HOURS BY {granularity.upper()} / {group.upper()} ---")
+    print(f"{granularity.upper():<12} | {group.upper():<28} | {'HOURS':>9} | {'ENTRIES':>7}")
+    print("-" * 66)
+    for row in cursor:
+        print(f"{row['bucket']:<12} | {row['label'][:28]:<28} | {row['hours']:>9} | {row['entries']:>7}")
+    print("-" * 66)
+
+FORECAST_PACE_QUERY = """
+SELECT
+    user_id,
+    SUM(CASE WHEN day > date('now', ?) THEN hours ELSE 0 END) AS short_hours,
+    SUM(hours) AS long_hours,
+    SUM(hours * hours) AS long_sq
+FROM (
+    SELECT user_id, service_date AS day, SUM(hours_worked) AS hours
+    FROM Service_Logs
+    WHERE service_date > date('now', ?) AND service_date <= date('now')
+    GROUP BY user_id, service_date
+)
+GROUP BY user_id
+"""
+
+def load_forecast_inputs(cursor):
+    """Column arrays for project_completion(): one pass per query, all users."""
+    short_days, long_days = FORECAST_WINDOWS
+    cursor.execute(FORECAST_PACE_QUERY, (f"-{short_days} days", f"-{long_days} days"))
+    pace = {row['user_id']: row for row in cursor}
+
+    columns = {name: [] for name in (
+        "user_id", "full_name", "remaining", "days_left", "short_hours", "long_hours", "long_sq")}
+    cursor.execute(ALL_STATUS_QUERY)
+    for row in cursor:
+        recent = pace.get(row['user_id'])
+        columns["user_id"].append(row['user_id'])
+        columns["full_name"].append(row['full_name'])
+        columns["remaining"].append(row['Remaining'])
+        columns["days_left"].append(row['Days_Left'])
+        columns["short_hours"].append(recent['short_hours'] if recent else 0.0)
+        columns["long_hours"].append(recent['long_hours'] if recent else 0.0)
+        columns["long_sq"].append(recent['long_sq'] if recent else 0.0)
+    return columns
+
+def project_completion(columns):
+    """Blended daily pace, days to finish and P(missing the deadline) per user.
+
+    Pace blends the short and long FORECAST_WINDOWS averages. Daily hours
+    are treated as independent draws with the long window's mean/variance,
+    so hours over the remaining D days ~ Normal(D*pace, D*var). Returns
+    (pace, days_to_finish, p_miss) lists; days_to_finish is inf when pace
+    is zero and 0 when already complete.
+    """
+    if np is not None:
+        return _project_numpy(columns)
+
+    short_days, long_days = FORECAST_WINDOWS
+    w = FORECAST_SHORT_WEIGHT
+    paces, finishes, risks = [], [], []
+    for remaining, days, short_h, long_h, long_sq in zip(
+            columns["remaining"], columns["days_left"], columns["short_hours"],
+            columns["long_hours"], columns["long_sq"]):
+        mean = long_h / long_days
+        var = max(long_sq / long_days - mean * mean, 0.0)
+        pace = w * short_h / short_days + (1 - w) * mean
+        if remaining <= 0:
+            finish, risk = 0.0, 0.0
+        else:
+            finish = remaining / pace if pace > 0 else math.inf
+            if days <= 0:
+                risk = 1.0
+            elif var > 0:
+                z = (remaining - days * pace) / math.sqrt(days * var)
+                risk = 0.5 * (1 + math.erf(z / math.sqrt(2)))
+            else:
+                risk = 1.0 if days * pace < remaining else 0.0
+        paces.append(pace)
+        finishes.append(finish)
+        risks.append(risk)
+    return paces, finishes, risks
+
+def _project_numpy(columns):
+    short_days, long_days = FORECAST_WINDOWS
+    w = FORECAST_SHORT_WEIGHT
+    remaining = np.asarray(columns["remaining"], dtype=float)
+    days = np.asarray(columns["days_left"], dtype=float)
+    mean = np.asarray(columns["long_hours"], dtype=float) / long_days
+    var = np.maximum(np.asarray(columns["long_sq"], dtype=float) / long_days - mean * mean, 0.0)
+    pace = w * np.asarray(columns["short_hours"], dtype=float) / short_days + (1 - w) * mean
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        finish = np.where(pace > 0, remaining / pace, np.inf)
+        z = (remaining - days * pace) / np.sqrt(days * var)
+    risk = np.where(var > 0, _norm_cdf_numpy(np.nan_to_num(z)), (days * pace < remaining).astype(float))
+    risk = np.where(days <= 0, 1.0, risk)
+    done = remaining <= 0
+    finish = np.where(done, 0.0, finish)
+    risk = np.where(done, 0.0, risk)
+    return pace.tolist(), finish.tolist(), risk.tolist()
+
+def _norm_cdf_numpy(z):
+    # Abramowitz & Stegun 7.1.26 erf approximation (|error| < 1.5e-7).
+    x = np.abs(z) / math.sqrt(2)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-x * x)
+    return 0.5 * (1.0 + np.sign(z) * erf)
+
+def forecast(fmt="table", limit=None):
+    """Ranks every user by risk of missing their deadline."""
+    start = time.perf_counter()
+    columns = load_forecast_inputs(get_db_connection().cursor())
+    paces, finishes, risks = project_completion(columns)
+    order = sorted(range(len(risks)), key=lambda i: (-risks[i], columns["days_left"][i]))
+    if limit:
+        order = order[:limit]
+    today = datetime.now().date()
+
+    def projected(i):
+        if finishes[i] == 0:
+            return "done"
+        if math.isinf(finishes[i]) or finishes[i] > 36500:
+            return "never"
+        return (today + timedelta(days=math.ceil(finishes[i]))).isoformat()
+
+    header = ["user_id", "full_name", "remaining", "days_left", "pace_per_day", "projected_completion", "p_miss"]
+    if fmt == "csv":
+        writer = csv.writer(sys.stdout)
+        writer.writerow(header)
+        for i in order:
+            writer.writerow([columns["user_id"][i], columns["full_name"][i], columns["remaining"][i],
+                             columns["days_left"][i], round(paces[i], 3), projected(i), round(risks[i], 4)])
+        return
+
+    print(f"\n--- 📈 DEADLINE RISK FORECAST ({'numpy' if np is not None else 'python'}) ---")
+    print(f"{'ID':>6} | {'NAME':<24} | {'LEFT':>7} | {'DAYS':>8} | {'PACE/D':>6} | {'PROJECTED':<10} | P(MISS)")
+    print("-" * 90)
+    for i in order:
+        print(f"{columns['user_id'][i]:>6} | {columns['full_name'][i][:24]:<24} | {columns['remaining'][i]:>7} | "
+              f"{columns['days_left'][i]:>8} | {paces[i]:>6.2f} | {projected(i):<10} | {risks[i]:.0%}")
+    print("-" * 90)
+    print(f"{len(risks)} users ranked in {time.perf_counter() - start:.3f}s\n")
+
+# --- AUDIT HASH CHAIN ---
+# entry_hash = SHA-256(previous entry_hash || canonical fields). Two
+# chains: Log_Chain over the facts of each log (including the supervisor
+# who signed off on the hours), and Verification_Chain over
+# Log_Verifications. is_verified is not a chained fact but state
+# derived from the latest verification entry, so verifying hours appends
+# a sealed entry instead of editing a sealed log. Any edit, deletion or
+# insertion into either sealed history breaks every later hash, and a
+# flag that disagrees with its log's latest sealed entry is reported.
+
+CHAIN_GENESIS = bytes(32)
+CHAIN_FIELDS = "log_id, user_id, agency_id, service_date, hours_worked, task_description, supervisor_name"
+VERIFICATION_FIELDS = "verification_id, log_id, verified, verifier, recorded_at"
+
+# (name, chain table, key, chained fields, source table, checkpoint table)
+LOG_CHAIN = ("log", "Log_Chain", "log_id", CHAIN_FIELDS, "Service_Logs", "Chain_Checkpoints")
+VERIFICATION_CHAIN = ("verification", "Verification_Chain", "verification_id", VERIFICATION_FIELDS,
+                      "Log_Verifications", "Verification_Checkpoints")
+
+def chain_hash(prev_hash, row):
+    payload = json.dumps(list(row), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(prev_hash + payload).digest()
+
+def _seal(cursor, spec):
+    _, chain, key, fields, source, _ = spec
+    cursor.execute(f"SELECT {key}, entry_hash FROM {chain} ORDER BY {key} DESC LIMIT 1")
+    last = cursor.fetchone()
+    last_id, prev = (last[0], last[1]) if last else (0, CHAIN_GENESIS)
+
+    sealed = 0
+    while True:
+        cursor.execute(
+            f"SELECT {fields} FROM {source} WHERE {key} > ? ORDER BY {key} LIMIT ?",
+            (last_id, CHAIN_BATCH_SIZE),
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return sealed
+        links = []
+        for row in rows:
+            prev = chain_hash(prev, row)
+            links.append((row[0], prev))
+        cursor.executemany(f"INSERT INTO {chain} ({key}, entry_hash) VALUES (?, ?)", links)
+        last_id = rows[-1][0]
+        sealed += len(rows)
+
+def seal_chain(cursor):
+    """Chains every Service_Logs row newer than the last sealed one.
+
+    Called inside each insert transaction, just before commit, so new rows
+    are sealed atomically with their insert (via seal_log_entries()). Rows
+    added by other tools are picked up by the next seal. Returns the number
+    of rows sealed.
+    """
+    return _seal(cursor, LOG_CHAIN)
+
+def seal_verifications(cursor):
+    """Chains every Log_Verifications entry newer than the last sealed one."""
+    return _seal(cursor, VERIFICATION_CHAIN)
+
+def seal_log_entries(cursor):
+    """Seals new logs and verification entries, and extends the Merkle tree."""
+    sealed = seal_chain(cursor)
+    seal_verifications(cursor)
+    extend_merkle(cursor)
+    return sealed
+
+def mark_verified(log_ids, verifier=None):
+    """Verifies logs by appending sealed Log_Verifications entries.
+
+    The entry's trigger sets Service_Logs.is_verified; setting the flag
+    any other way is reported by verify_chain().
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    entries = []
+    for log_id in dict.fromkeys(log_ids):
+        cursor.execute("SELECT 1 FROM Service_Logs WHERE log_id = ?", (log_id,))
+        if cursor.fetchone() is None:
+            print(f"❌ Unknown log {log_id}.")
+            continue
+        cursor.execute(
+            "SELECT verified FROM Log_Verifications WHERE log_id = ? ORDER BY verification_id DESC LIMIT 1",
+            (log_id,),
+        )
+        latest = cursor.fetchone()
+        if latest is not None and latest[0]:
+            print(f"⚠️ log {log_id} is already verified.")
+            continue
+        entries.append((log_id, verifier))
+
+    cursor.executemany("INSERT INTO Log_Verifications (log_id, verified, verifier) VALUES (?, 1, ?)", entries)
+    seal_log_entries(cursor)
+    conn.commit()
+    print(f"✅ Verified {len(entries)} log entries.")
+    return len(entries)
+
+# --- MERKLE TREE (RFC 6962 hashing) ---
+# Leaves are Log_Chain entry hashes in log_id order. Node (level, i)
+# covers leaves [i * 2**level, (i + 1) * 2**level); level 0 lives in
+# Merkle_Leaves. Trees whose size is not a power of two are split at the
+# largest power of two below the size, exactly as RFC 6962 does, so
+# proofs can be checked by any standard verifier.
+
+def merkle_leaf(entry_hash):
+    return hashlib.sha256(b"\x00" + entry_hash).digest()
+
+def merkle_node(left, right):
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def _split(size):
+    """Largest power of two strictly below `size` (size >= 2)."""
+    return 1 << ((size - 1).bit_length() - 1)
+
+def extend_merkle(cursor):
+    """Appends newly chained entries as leaves, storing completed subtrees."""
+    cursor.execute("SELECT IFNULL(MAX(leaf_index) + 1, 0), IFNULL(MAX(log_id), 0) FROM Merkle_Leaves")
+    size, last_log_id = cursor.fetchone()
+    cursor.execute("SELECT log_id, entry_hash FROM Log_Chain WHERE log_id > ? ORDER BY log_id", (last_log_id,))
+    links = cursor.fetchall()
+    if not links:
+        return 0
+
+    written = {}
+
+    def node(level, index):
+        found = written.get((level, index))
+        if found is None:
+            found = _merkle_node_hash(cursor, level, index)
+        return found
+
+    leaves, nodes = [], []
+    for log_id, entry_hash in links:
+        index = size
+        current = merkle_leaf(entry_hash)
+        leaves.append((index, log_id, current))
+        written[(0, index)] = current
+        level = 0
+        while index & 1:
+            current = merkle_node(node(level, index - 1), current)
+            level += 1
+            index >>= 1
+            nodes.append((level, index, current))
+            written[(level, index)] = current
+        size += 1
+
+    cursor.executemany("INSERT INTO Merkle_Leaves (leaf_index, log_id, hash) VALUES (?, ?, ?)", leaves)
+    cursor.executemany("INSERT INTO Merkle_Nodes (level, node_index, hash) VALUES (?, ?, ?)", nodes)
+    return len(leaves)
+
+def _merkle_node_hash(cursor, level, index):
+    if level == 0:
+        cursor.execute("SELECT hash FROM Merkle_Leaves WHERE leaf_index = ?", (index,))
+    else:
+        cursor.execute("SELECT hash FROM Merkle_Nodes WHERE level = ? AND node_index = ?", (level, index))
+    row = cursor.fetchone()
+    if row is None:
+        raise LookupError(f"Merkle node ({level}, {index}) is missing")
+    return row[0]
+
+def merkle_subtree(cursor, start, size):
+    """Hash of leaves [start, start + size): O(log n) stored-node lookups."""
+    if size & (size - 1) == 0 and start % size == 0:
+        return _merkle_node_hash(cursor, size.bit_length() - 1, start // size)
+    k = _split(size)
+    return merkle_node(merkle_subtree(cursor, start, k), merkle_subtree(cursor, start + k, size - k))
+
+def merkle_tree_size(cursor):
+    cursor.execute("SELECT IFNULL(MAX(leaf_index) + 1, 0) FROM Merkle_Leaves")
+    return cursor.fetchone()[0]
+
+def merkle_path(cursor, index, start, size):
+    """RFC 6962 audit path for leaf `index` within leaves [start, start + size)."""
+    if size == 1:
+        return []
+    k = _split(size)
+    if index < k:
+        return merkle_path(cursor, index, start, k) + [merkle_subtree(cursor, start + k, size - k)]
+    return merkle_path(cursor, index - k, start + k, size - k) + [merkle_subtree(cursor, start, k)]
+
+def root_from_path(leaf_hash, index, size, path):
+    """Recomputes the root an audit path commits to."""
+    if size == 1:
+        if path:
+            raise ValueError("Audit path is too long")
+        return leaf_hash
+    if not path:
+        raise ValueError("Audit path is too short")
+    k = _split(size)
+    if index < k:
+        return merkle_node(root_from_path(leaf_hash, index, k, path[:-1]), path[-1])
+    return merkle_node(path[-1], root_from_path(leaf_hash, index - k, size - k, path[:-1]))
+
+def signing_key():
+    key = os.environ.get(SIGNING_KEY_ENV)
+    return key.encode("utf-8") if key else None
+
+def sign_root(tree_size, root_hash, signed_at, key):
+    message = f"{tree_size}:{root_hash.hex()}:{signed_at}".encode("utf-8")
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+def publish_merkle_root():
+    """Brings the tree up to date, records the root and prints it as JSON.
+
+    The root is signed with HMAC-SHA256 when SIGNING_KEY_ENV is set.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    seal_log_entries(cursor)
+    size = merkle_tree_size(cursor)
+    if size == 0:
+        print("❌ No sealed entries yet.")
+        return None
+    root = merkle_subtree(cursor, 0, size)
+    signed_at = datetime.now().astimezone().isoformat(timespec="seconds")
+    key = signing_key()
+    signature = sign_root(size, root, signed_at, key) if key else None
+    cursor.execute(
+        "INSERT INTO Merkle_Roots (tree_size, root_hash, signed_at, signature) VALUES (?, ?, ?, ?)",
+        (size, root, signed_at, signature),
+    )
+    conn.commit()
+
+    published = {
+        "tree_size": size,
+        "root": root.hex(),
+        "signed_at": signed_at,
+        "signature": signature,
+        "signature_alg": "HMAC-SHA256" if signature else None,
+    }
+    if not key:
+        print(f"⚠️ {SIGNING_KEY_ENV} is not set; root is unsigned.", file=sys.stderr)
+    print(json.dumps(published, indent=2))
+    return published
+
+def published_root(cursor, tree_size=None):
+    """The latest published Merkle_Roots record, optionally for one tree size."""
+    if tree_size is None:
+        cursor.execute("SELECT tree_size, root_hash, signed_at, signature FROM Merkle_Roots ORDER BY rowid DESC LIMIT 1")
+    else:
+        cursor.execute(
+            "SELECT tree_size, root_hash, signed_at, signature FROM Merkle_Roots "
+            "WHERE tree_size = ? ORDER BY rowid DESC LIMIT 1",
+            (tree_size,),
+        )
+    return cursor.fetchone()
+
+def prove_entry(log_id, tree_size=None):
+    """Prints an inclusion proof for `log_id` as JSON.
+
+    Proofs are only issued against published roots (--merkle-root), and
+    carry the root's signed_at and signature so a verifier can check them
+    against the signing key. `tree_size` picks an earlier published root;
+    default is the latest one.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    seal_log_entries(cursor)
+    conn.commit()
+
+    cursor.execute("SELECT leaf_index, hash FROM Merkle_Leaves WHERE log_id = ?", (log_id,))
+    leaf = cursor.fetchone()
+    if leaf is None:
+        print(f"❌ log {log_id} is not in the Merkle tree.")
+        return None
+    published = published_root(cursor, tree_size)
+    if published is None:
+        wanted = f"for tree size {tree_size}" if tree_size else "yet"
+        print(f"❌ No root has been published {wanted}; run --merkle-root first.")
+        return None
+    size = published['tree_size']
+    if not leaf['leaf_index'] < size <= merkle_tree_size(cursor):
+        print(f"❌ The published tree of size {size} does not include log {log_id} (leaf {leaf['leaf_index']}).")
+        return None
+
+    cursor.execute(f"SELECT {CHAIN_FIELDS} FROM Service_Logs WHERE log_id = ?", (log_id,))
+    entry = cursor.fetchone()
+    cursor.execute("SELECT entry_hash FROM Log_Chain WHERE log_id < ? ORDER BY log_id DESC LIMIT 1", (log_id,))
+    prev = cursor.fetchone()
+
+    path = merkle_path(cursor, leaf['leaf_index'], 0, size)
+    if root_from_path(leaf['hash'], leaf['leaf_index'], size, path) != published['root_hash']:
+        print(f"❌ The stored tree no longer matches the root published for size {size}.")
+        return None
+    proof = {
+        "log_id": log_id,
+        "entry": list(entry) if entry else None,
+        "prev_hash": (prev[0] if prev else CHAIN_GENESIS).hex(),
+        "leaf_index": leaf['leaf_index'],
+        "tree_size": size,
+        "path": [h.hex() for h in path],
+        "root": published['root_hash'].hex(),
+        "signed_at": published['signed_at'],
+        "signature": published['signature'],
+        "signature_alg": "HMAC-SHA256" if published['signature'] else None,
+    }
+    print(json.dumps(proof, indent=2, ensure_ascii=False))
+    return proof
+
+def verify_proof(path, trusted_root=None):
+    """Checks a proof file from --prove; needs no database access.
+
+    The root the path leads to must be trusted: either equal to
+    `trusted_root` (hex, obtained out of band), or carry a valid HMAC
+    signature under SIGNING_KEY_ENV. The proof's own "root" field is never
+    trusted on its own, since whoever wrote the file could have forged it.
+    """
+    with open(path, encoding="utf-8") as f:
+        proof = json.load(f)
+    if proof.get("entry") is None:
+        print("❌ Proof carries no entry (it was deleted after sealing).")
+        return False
+    try:
+        expected = bytes.fromhex(trusted_root) if trusted_root else None
+        entry_hash = chain_hash(bytes.fromhex(proof["prev_hash"]), proof["entry"])
+        root = root_from_path(
+            merkle_leaf(entry_hash),
+            proof["leaf_index"],
+            proof["tree_size"],
+            [bytes.fromhex(h) for h in proof["path"]],
+        )
+    except (KeyError, TypeError, ValueError) as exc:
+        print(f"❌ Malformed proof or root: {exc}")
+        return False
+
+    key = signing_key()
+    if expected is not None:
+        if not hmac.compare_digest(root, expected):
+            print(f"❌ Proof does NOT match trusted root {expected.hex()}")
+            return False
+        trusted_by = "the trusted root"
+    elif key is not None:
+        signature = proof.get("signature")
+        if not signature:
+            print("❌ Proof's root is unsigned; pass --root to check it against a trusted root.")
+            return False
+        expected_signature = sign_root(proof["tree_size"], root, proof.get("signed_at"), key)
+        if not hmac.compare_digest(expected_signature, str(signature)):
+            print(f"❌ Root signature is invalid for tree of size {proof['tree_size']} (root {root.hex()})")
+            return False
+        trusted_by = f"the signature from {proof.get('signed_at')}"
+    else:
+        print(f"❌ No trusted root: pass --root HEX or set {SIGNING_KEY_ENV} to check the signed root.")
+        return False
+    print(f"✅ log {proof['log_id']} is included in tree of size {proof['tree_size']} with root {root.hex()}"
+          f" (checked against {trusted_by})")
+    return True
+
+# Logs whose is_verified flag disagrees with their latest verification
+# entry: set without one, or cleared while the latest entry says verified.
+VERIFICATION_FLAG_QUERY = """
+SELECT s.log_id, 'marked verified without a sealed verification entry'
+FROM Service_Logs s
+WHERE s.is_verified AND NOT IFNULL((
+    SELECT v.verified FROM Log_Verifications v
+    WHERE v.log_id = s.log_id
+    ORDER BY v.verification_id DESC LIMIT 1
+), 0)
+UNION ALL
+SELECT v.log_id, 'verification cleared without a sealed entry'
+FROM Log_Verifications v
+JOIN Service_Logs s ON s.log_id = v.log_id
+WHERE v.verified AND NOT s.is_verified
+  AND v.verification_id = (SELECT MAX(verification_id) FROM Log_Verifications WHERE log_id = v.log_id)
+ORDER BY 1
+"""
+
+def _walk_chain(conn, spec, full):
+    """Checks one chain from its last checkpoint (or genesis).
+
+    Records a checkpoint every CHAIN_CHECKPOINT_INTERVAL verified rows and
+    at the end. Returns (problems, rows walked, rows verified in total,
+    id the walk started after).
+    """
+    name, chain, key, fields, source, checkpoint_table = spec
+    cursor = conn.cursor()
+    start_id, prev, verified = 0, CHAIN_GENESIS, 0
+    if not full:
+        cursor.execute(f"SELECT {key}, entry_hash, rows_verified FROM {checkpoint_table} ORDER BY {key} DESC LIMIT 1")
+        checkpoint = cursor.fetchone()
+        if checkpoint:
+            start_id, prev, verified = checkpoint
+    problems = []
+    checkpoints = []
+    walked = 0
+    last_good = (start_id, prev)
+
+    # Full outer walk: chain links without a source row, and source rows
+    # without a link, are both tampering.
+    reader = conn.cursor()
+    reader.arraysize = EXPORT_FETCH_SIZE
+    reader.execute(f"""
+        SELECT c.{key} AS chain_id, c.entry_hash, s.*
+        FROM {chain} c
+        LEFT JOIN (SELECT {fields} FROM {source}) s ON s.{key} = c.{key}
+        WHERE c.{key} > ?
+        UNION ALL
+        SELECT NULL, NULL, {fields}
+        FROM {source}
+        WHERE {key} > ? AND {key} NOT IN (SELECT {key} FROM {chain})
+        ORDER BY 1
+    """, (start_id, start_id))
+    while True:
+        rows = reader.fetchmany()
+        if not rows:
+            break
+        for row in rows:
+            walked += 1
+            if row['chain_id'] is None:
+                problems.append(f"{name} {row[key]}: row is not in the chain (inserted out of order?)")
+                continue
+            if row[key] is None:
+                problems.append(f"{name} {row['chain_id']}: sealed entry was deleted")
+                prev = row['entry_hash']  # continue from the stored link
+                continue
+            expected = chain_hash(prev, tuple(row)[2:])
+            if expected != row['entry_hash']:
+                problems.append(f"{name} {row[key]}: hash mismatch (entry was altered)")
+            prev = row['entry_hash']
+            if not problems:
+                verified += 1
+                last_good = (row[key], prev)
+                if verified % CHAIN_CHECKPOINT_INTERVAL == 0:
+                    checkpoints.append((row[key], prev, verified))
+
+    if not problems and last_good[0] > start_id:
+        checkpoints.append((last_good[0], last_good[1], verified))
+    cursor.executemany(
+        f"INSERT OR REPLACE INTO {checkpoint_table} ({key}, entry_hash, rows_verified) VALUES (?, ?, ?)",
+        checkpoints,
+    )
+    return problems, walked, verified, start_id
+
+def verify_chain(full=False):
+    """Checks the log and verification chains and the is_verified flags.
+
+    Each chain is streamed from its last checkpoint (or genesis), so the
+    next run only walks rows added since. Flags are current state rather
+    than history, so they are always checked in full (one SQL pass).
+    Returns the list of problems found (empty when everything is intact).
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    sealed_now = seal_log_entries(cursor)
+    conn.commit()
+
+    print(f"\n--- 🔗 VERIFYING AUDIT CHAIN{' (full)' if full else ''} ---")
+    started = time.perf_counter()
+    problems = []
+    walked = 0
+    for spec in (LOG_CHAIN, VERIFICATION_CHAIN):
+        chain_problems, chain_walked, chain_verified, start_id = _walk_chain(conn, spec, full)
+        problems += chain_problems
+        walked += chain_walked
+        print(f"   {spec[0]} chain: {chain_walked} entries after {spec[0]} {start_id}, "
+              f"{chain_verified} verified in total")
+    conn.commit()
+
+    cursor.execute(VERIFICATION_FLAG_QUERY)
+    problems += [f"log {log_id}: {problem}" for log_id, problem in cursor.fetchall()]
+
+    elapsed = time.perf_counter() - started
+    rate = walked / elapsed if elapsed > 0 else float(walked)
+    if sealed_now:
+        print(f"🔏 Sealed {sealed_now} new entries before verifying.")
+    for problem in problems[:CHAIN_MAX_PROBLEMS]:
+        print(f"❌ {problem}")
+    if len(problems) > CHAIN_MAX_PROBLEMS:
+        print(f"   ... and {len(problems) - CHAIN_MAX_PROBLEMS} more")
+    if problems:
+        print(f"🚨 Chain BROKEN: {len(problems)} problems in {walked} rows ({elapsed:.3f}s)")
+    else:
+        print(f"✅ Chain intact: {walked} rows checked in {elapsed:.3f}s ({rate:,.0f} rows/sec)")
+    return problems
+
+def explain_queries():
+    """Prints SQLite's query plan for the status and report hot paths."""
+    cursor = get_db_connection().cursor()
+    for name, query in (("STATUS", STATUS_QUERY), ("REPORT", REPORT_QUERY)):
+        print(f"\n--- 🔍 QUERY PLAN: {name} ---")
+        cursor.execute("EXPLAIN QUERY PLAN " + query, (USER_ID,))
+        for row in cursor.fetchall():
+            print(f"  {row['detail']}")
+
+def parse_log_entry(entry):
+    parts = [part.strip() for part in entry.split("|")]
+    if len(parts) < 3 or len(parts) > 4:
+        raise ValueError("Log entry must be: agency_id|hours|description|date(optional)")
 
     agency_id = int(parts[0])
-    hours = float(parts[1])
+    hours = parse_hours(parts[1])
     desc = parts[2]
     date = parts[3] if len(parts) == 4 and parts[3] else None
     return agency_id, hours, desc, date
 
 def main():
-    # AUTO-FIX: Ensure DB exists before menu loads
-    setup_database()
-    
+    try:
+        run_cli()
+    finally:
+        close_db_connection()
+
+def run_cli():
+    global DURABILITY, USER_ID, PROFILER
+
     parser = argparse.ArgumentParser(description="Service Finder CLI")
+    parser.add_argument(
+        "--user",
+        type=int,
+        help=f"User ID to log, report and show status for (default {USER_ID}; --export defaults to all users)",
+    )
     parser.add_argument(
         "--log",
         action="append",
         help="Log hours: agency_id|hours|description|date(optional YYYY-MM-DD)",
     )
+    parser.add_argument(
+        "--log-file",
+        help="Bulk log hours from a file of agency_id|hours|description|date lines ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BULK_BATCH_SIZE,
+        help=f"Rows per executemany batch for bulk logging and CSV import (default {BULK_BATCH_SIZE})",
+    )
+    parser.add_argument("--import-csv", metavar="PATH", help="Bulk import historical logs from a CSV file")
+    parser.add_argument(
+        "--map",
+        action="append",
+        metavar="FIELD=COLUMN",
+        help=f"Map a CSV column to an import field for --import-csv (fields: {', '.join(IMPORT_FIELDS)})",
+    )
+    parser.add_argument("--rejects", help="Where --import-csv writes rejected rows (default <PATH>.rejects.csv)")
+    parser.add_argument(
+        "--durability",
+        choices=sorted(DURABILITY_PROFILES),
+        default=DURABILITY,
+        help=f"SQLite durability/speed profile (default {DURABILITY})",
+    )
     parser.add_argument("--report", action="store_true", help="Generate compliance report")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="With --report, append only new entries to Timesheet_<user>.txt",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Write the report file without echoing it to stdout",
+    )
+    parser.add_argument(
+        "--report-all",
+        action="store_true",
+        help="Generate one compliance report per user using a worker pool",
+    )
+    parser.add_argument("--report-dir", default=".", help="Output directory for --report-all (default .)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=REPORT_WORKERS,
+        help=f"Worker count for --report-all (default {REPORT_WORKERS})",
+    )
+    parser.add_argument(
+        "--executor",
+        choices=["thread", "process"],
+        default="thread",
+        help="Pool type for --report-all (default thread)",
+    )
     parser.add_argument("--status", action="store_true", help="Show burn rate status")
+    parser.add_argument(
+        "--rebuild-totals",
+        action="store_true",
+        help="Recompute User_Totals from Service_Logs and report inconsistencies",
+    )
+    parser.add_argument(
+        "--all-users",
+        action="store_true",
+        help="Show burn rate status for every user in one query",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["table", "csv"],
+        default="table",
+        help="Output format for --all-users, --aggregate and --forecast (default table)",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="PATH",
+        help="Stream Service_Logs to PATH ('-' for stdout); .gz/.bz2/.xz compresses",
+    )
+    parser.add_argument(
+        "--export-format",
+        choices=["csv", "ndjson"],
+        default="csv",
+        help="Format for --export (default csv)",
+    )
+    parser.add_argument("--since", help="Only export/aggregate entries on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Only export/aggregate entries on or before this date (YYYY-MM-DD)")
+    parser.add_argument(
+        "--search",
+        metavar="QUERY",
+        help="Full-text search task descriptions and supervisor names (FTS5 syntax)",
+    )
+    parser.add_argument("--page", type=int, default=1, help="Result page for --search (default 1)")
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=SEARCH_PAGE_SIZE,
+        help=f"Results per page for --search (default {SEARCH_PAGE_SIZE})",
+    )
+    parser.add_argument("--aggregate", action="store_true", help="Show hours per time bucket and group")
+    parser.add_argument(
+        "--granularity",
+        choices=sorted(AGGREGATE_BUCKETS),
+        default="week",
+        help="Time bucket for --aggregate (default week)",
+    )
+    parser.add_argument(
+        "--group-by",
+        choices=sorted(AGGREGATE_GROUPS),
+        default="agency",
+        help="Grouping for --aggregate (default agency)",
+    )
+    parser.add_argument(
+        "--rollup",
+        action="store_true",
+        help="Answer --aggregate from the incrementally refreshed daily rollup table",
+    )
+    parser.add_argument(
+        "--forecast",
+        action="store_true",
+        help="Rank all users by projected risk of missing their deadline",
+    )
+    parser.add_argument("--limit", type=int, help="Only show the top N users for --forecast")
+    parser.add_argument(
+        "--mark-verified",
+        type=int,
+        action="append",
+        metavar="LOG_ID",
+        help="Verify a log entry by appending a sealed verification entry (repeatable)",
+    )
+    parser.add_argument("--verifier", help="Name recorded on --mark-verified entries")
+    parser.add_argument(
+        "--verify-chain",
+        action="store_true",
+        help="Verify the audit hash chain from the last checkpoint",
+    )
+    parser.add_argument("--full", action="store_true", help="With --verify-chain, verify from the first entry")
+    parser.add_argument(
+        "--merkle-root",
+        action="store_true",
+        help=f"Publish the current Merkle root as JSON (HMAC-signed if ${SIGNING_KEY_ENV} is set)",
+    )
+    parser.add_argument("--prove", type=int, metavar="LOG_ID", help="Print a Merkle inclusion proof for a log entry")
+    parser.add_argument("--tree-size", type=int, help="With --prove, prove against this earlier published tree size")
+    parser.add_argument("--verify-proof", metavar="FILE", help="Check an inclusion proof produced by --prove")
+    parser.add_argument(
+        "--root",
+        metavar="HEX",
+        help=f"With --verify-proof, the trusted root to check against (else the root's ${SIGNING_KEY_ENV} signature)",
+    )
+    parser.add_argument("--explain", action="store_true", help="Print query plans for status and report")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-phase and per-statement timings to stderr",
+    )
+    parser.add_argument("--profile-json", help="Write --profile timings as JSON to this file")
     args = parser.parse_args()
+    DURABILITY = args.durability
+    if args.user is not None:
+        USER_ID = args.user
+    if args.profile or args.profile_json:
+        PROFILER = Profiler()
 
-    if args.log or args.report or args.status:
-        if args.log:
-            for entry in args.log:
-                agency_id, hours, desc, date = parse_log_entry(entry)
-                log_hours_entry(agency_id, hours, desc, date)
-        if args.status:
-            show_status()
-        if args.report:
-            generate_report()
+    try:
+        run_commands(args)
+    finally:
+        if PROFILER is not None:
+            if args.profile:
+                PROFILER.print_breakdown()
+            if args.profile_json:
+                with open(args.profile_json, "w", encoding="utf-8") as f:
+                    json.dump(PROFILER.to_dict(), f, indent=2)
+
+def run_commands(args):
+    # AUTO-FIX: Ensure DB exists before menu loads
+    with profile_phase("setup_database"):
+        setup_database()
+    if args.user is not None and not user_exists(get_db_connection().cursor(), args.user):
+        print(f"❌ Unknown user {args.user}; add them to User_Profile first.")
+        sys.exit(1)
+
+    # (enabled, phase name, command) in execution order
+    commands = [
+        (args.log, "log", lambda: log_hours_checked((parse_log_entry(entry) for entry in args.log), args.batch_size)),
+        (args.log_file, "log_file", lambda: log_hours_checked(iter_log_file(args.log_file), args.batch_size)),
+        (args.import_csv, "import_csv",
+         lambda: import_csv(args.import_csv, parse_column_map(args.map), args.batch_size, args.rejects)),
+        (args.rebuild_totals, "rebuild_totals", rebuild_user_totals),
+        (args.status, "status", show_status),
+        (args.all_users, "all_users", lambda: show_all_status(args.format)),
+        (args.report, "report", lambda: generate_report(echo=not args.quiet, incremental=args.incremental)),
+        (args.report_all, "report_all", lambda: generate_all_reports(args.report_dir, args.workers, args.executor)),
+        (args.export, "export", lambda: export_logs(args.export, args.export_format, args.since, args.until, args.user)),
+        (args.search, "search", lambda: search_logs(args.search, args.page, args.page_size, args.user)),
+        (args.aggregate, "aggregate", lambda: aggregate_hours(
+            args.granularity, args.group_by, args.since, args.until, args.format, args.rollup)),
+        (args.forecast, "forecast", lambda: forecast(args.format, args.limit)),
+        (args.mark_verified, "mark_verified", lambda: mark_verified(args.mark_verified, args.verifier)),
+        (args.verify_chain, "verify_chain", lambda: verify_chain(args.full)),
+        (args.merkle_root, "merkle_root", publish_merkle_root),
+        (args.prove is not None, "prove", lambda: prove_entry(args.prove, args.tree_size)),
+        (args.verify_proof, "verify_proof", lambda: verify_proof(args.verify_proof, args.root)),
+        (args.explain, "explain", explain_queries),
+    ]
+    if any(enabled for enabled, _, _ in commands):
+        for enabled, name, command in commands:
+            if enabled:
+                with profile_phase(name):
+                    command()
         return
 
     while True:
@@ -0,0 +1,94 @@
+"""Tamper-evidence tests for the log and verification chains."""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cli"))
+
+import credential_issuer as ci  # noqa: E402
+import service_finder as sf  # noqa: E402
+
+
+class AuditChainTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="sf-test-")
+        sf.DB_NAME = os.path.join(self.workdir, "test.db")
+        sf.USER_ID = 1
+        with contextlib.redirect_stdout(io.StringIO()):
+            sf.setup_database()
+            for day in range(1, 5):
+                sf.log_hours_entry(1, 10.0, f"Shift {day}", f"2026-01-0{day}")
+        self.conn = sf.get_db_connection()
+
+    def tearDown(self):
+        sf.close_db_connection()
+        shutil.rmtree(self.workdir)
+
+    def quiet(self, fn, *args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args)
+
+    def issued_users(self):
+        cursor = self.conn.cursor()
+        self.quiet(sf.seal_log_entries, cursor)
+        return [c["evidence"]["payload"]["user_id"] for c in ci.iter_credentials(cursor)]
+
+    def test_clean_chain(self):
+        self.assertEqual(self.quiet(sf.verify_chain, True), [])
+
+    def test_mark_verified_is_sealed(self):
+        self.assertEqual(self.quiet(sf.mark_verified, [1, 2, 2], "Supervisor"), 2)
+        flags = self.conn.execute("SELECT log_id, is_verified FROM Service_Logs ORDER BY log_id").fetchall()
+        self.assertEqual([tuple(row) for row in flags], [(1, 1), (2, 1), (3, 0), (4, 0)])
+        self.assertEqual(self.quiet(sf.verify_chain), [])
+        self.assertEqual(self.quiet(sf.verify_chain, True), [])
+        self.assertEqual(self.quiet(sf.mark_verified, [1]), 0)
+
+    def test_flipped_flag_is_detected(self):
+        self.conn.execute("UPDATE Service_Logs SET is_verified = 1 WHERE log_id = 3")
+        self.conn.commit()
+        problems = self.quiet(sf.verify_chain)
+        self.assertEqual(len(problems), 1)
+        self.assertIn("log 3", problems[0])
+
+    def test_cleared_flag_is_detected(self):
+        self.quiet(sf.mark_verified, [2])
+        self.conn.execute("UPDATE Service_Logs SET is_verified = 0 WHERE log_id = 2")
+        self.conn.commit()
+        problems = self.quiet(sf.verify_chain)
+        self.assertEqual(len(problems), 1)
+        self.assertIn("log 2", problems[0])
+
+    def test_altered_log_is_detected(self):
+        self.conn.execute("UPDATE Service_Logs SET hours_worked = 99 WHERE log_id = 2")
+        self.conn.commit()
+        problems = self.quiet(sf.verify_chain, True)
+        self.assertTrue(any("log 2" in problem and "altered" in problem for problem in problems))
+
+    def test_altered_supervisor_is_detected(self):
+        self.conn.execute("UPDATE Service_Logs SET supervisor_name = 'Forged Judge' WHERE log_id = 3")
+        self.conn.commit()
+        problems = self.quiet(sf.verify_chain, True)
+        self.assertTrue(any("log 3" in problem and "altered" in problem for problem in problems))
+
+    def test_verification_entries_are_append_only(self):
+        self.quiet(sf.mark_verified, [1])
+        with self.assertRaises(sf.sqlite3.IntegrityError):
+            self.conn.execute("UPDATE Log_Verifications SET verified = 0")
+        with self.assertRaises(sf.sqlite3.IntegrityError):
+            self.conn.execute("DELETE FROM Log_Verifications")
+
+    def test_issuer_ignores_flipped_flags(self):
+        self.conn.execute("UPDATE Service_Logs SET is_verified = 1")
+        self.conn.commit()
+        self.assertEqual(self.issued_users(), [])
+        self.quiet(sf.mark_verified, [1, 2, 3, 4])
+        self.assertEqual(self.issued_users(), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
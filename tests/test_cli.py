@@ -0,0 +1,64 @@
+"""End-to-end CLI tests, run as a subprocess in a scratch directory."""
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cli", "service_finder.py")
+
+
+class CLITest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="sf-test-")
+        self.run_cli("--status")
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def run_cli(self, *args):
+        return subprocess.run(
+            [sys.executable, CLI, *args], cwd=self.workdir, capture_output=True, text=True, encoding="utf-8"
+        )
+
+    def log_count(self):
+        db = [name for name in os.listdir(self.workdir) if name.endswith(".db")][0]
+        with sqlite3.connect(os.path.join(self.workdir, db)) as conn:
+            return conn.execute("SELECT COUNT(*) FROM Service_Logs").fetchone()[0]
+
+    def test_unknown_user_is_rejected(self):
+        for args in (["--report"], ["--report", "--incremental"], ["--log", "1|2|Shift"], ["--status"]):
+            with self.subTest(args=args):
+                result = self.run_cli("--user", "999", *args)
+                self.assertEqual(result.returncode, 1)
+                self.assertIn("Unknown user 999", result.stdout)
+        self.assertFalse([name for name in os.listdir(self.workdir) if name.startswith("Timesheet")])
+        self.assertEqual(self.log_count(), 0)
+
+    def test_log_file_reports_bad_line(self):
+        for bad in ("1|two|Shift", "1|nan|Shift", "1|-4|Shift", "1|inf|Shift", "1|2"):
+            with self.subTest(bad=bad):
+                with open(os.path.join(self.workdir, "entries.psv"), "w", encoding="utf-8") as f:
+                    f.write(f"# partner export\n1|2|Shift|2026-01-01\n{bad}\n1|3|Shift|2026-01-02\n")
+                result = self.run_cli("--log-file", "entries.psv")
+                self.assertEqual(result.returncode, 1)
+                self.assertIn("❌ entries.psv:3:", result.stdout)
+                self.assertNotIn("Traceback", result.stderr)
+                self.assertEqual(self.log_count(), 0)
+
+    def test_log_rejects_bad_hours(self):
+        result = self.run_cli("--log", "1|nan|Shift")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("hours_worked must be a positive number", result.stdout)
+        self.assertEqual(self.log_count(), 0)
+
+    def test_known_user(self):
+        result = self.run_cli("--user", "1", "--log", "1|2|Shift|2026-01-01")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(self.log_count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
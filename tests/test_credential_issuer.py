@@ -0,0 +1,109 @@
+"""Credential issuer tests: eligibility and idempotent re-runs."""
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cli"))
+
+import credential_issuer as ci  # noqa: E402
+import service_finder as sf  # noqa: E402
+
+
+class IssueCredentialsTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="sf-test-")
+        self.output = os.path.join(self.workdir, "registry.ndjson")
+        sf.DB_NAME = os.path.join(self.workdir, "test.db")
+        sf.USER_ID = 1
+        with contextlib.redirect_stdout(io.StringIO()):
+            sf.setup_database()
+            sf.log_hours_bulk((1, 10.0, f"Shift {day}", f"2026-01-0{day}") for day in range(1, 5))
+            sf.mark_verified([1, 2, 3, 4])
+        self.conn = sf.get_db_connection()
+
+    def tearDown(self):
+        sf.close_db_connection()
+        shutil.rmtree(self.workdir)
+
+    def issue(self, append=True, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return ci.issue_credentials(self.output, append=append, **kwargs)
+
+    def registry(self):
+        with open(self.output, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_issue_is_recorded(self):
+        self.assertEqual(self.issue(), 1)
+        credential = self.registry()[0]
+        row = self.conn.execute("SELECT did, hours_verified, entries FROM Issued_Credentials WHERE user_id = 1").fetchone()
+        self.assertEqual(tuple(row), (credential["did"], 40.0, 4))
+
+    def test_rerun_skips_issued_users(self):
+        self.assertEqual(self.issue(), 1)
+        self.assertEqual(self.issue(), 0)
+        self.assertEqual(self.issue(user_id=1), 0)
+        self.assertEqual(len(self.registry()), 1)
+
+    def test_reissue(self):
+        self.issue()
+        self.assertEqual(self.issue(reissue=True), 1)
+        first, second = self.registry()
+        self.assertNotEqual(first["did"], second["did"])
+        rows = self.conn.execute("SELECT did FROM Issued_Credentials").fetchall()
+        self.assertEqual([row[0] for row in rows], [second["did"]])
+
+    def test_rerun_keeps_replaced_file(self):
+        self.assertEqual(self.issue(append=False), 1)
+        issued = self.registry()
+        self.assertEqual(self.issue(append=False), 0)
+        self.assertEqual(self.registry(), issued)
+        self.assertEqual(os.listdir(self.workdir).count("registry.ndjson"), 1)
+        self.assertFalse([name for name in os.listdir(self.workdir) if name.endswith(".partial")])
+
+    def test_replace_refuses_existing_file(self):
+        self.issue(append=False)
+        issued = self.registry()
+        sf.USER_ID = 2
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.conn.execute(
+                "INSERT INTO User_Profile (user_id, full_name, total_hours_required, deadline_date) "
+                "VALUES (2, 'Second', 10.0, '2026-06-01')"
+            )
+            sf.log_hours_entry(1, 10.0, "Shift", "2026-01-05")
+            sf.mark_verified([5])
+        self.assertEqual(self.issue(append=False), 0)
+        self.assertEqual(self.registry(), issued)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM Issued_Credentials").fetchone()[0], 1)
+        self.assertEqual(self.issue(), 1)
+        self.assertEqual(len(self.registry()), 2)
+
+    def test_reissue_replaces_file(self):
+        self.issue(append=False)
+        first = self.registry()
+        self.assertEqual(self.issue(append=False, reissue=True), 1)
+        second = self.registry()
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first[0]["did"], second[0]["did"])
+
+    def test_nothing_issued_creates_no_file(self):
+        self.conn.execute("UPDATE User_Profile SET total_hours_required = 100")
+        self.conn.commit()
+        self.assertEqual(self.issue(append=False), 0)
+        self.assertFalse(os.path.exists(self.output))
+        self.assertFalse([name for name in os.listdir(self.workdir) if name.endswith(".partial")])
+
+    def test_unmet_requirement(self):
+        self.conn.execute("UPDATE User_Profile SET total_hours_required = 100")
+        self.conn.commit()
+        self.assertEqual(self.issue(), 0)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM Issued_Credentials").fetchone()[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
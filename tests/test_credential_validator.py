@@ -0,0 +1,132 @@
+"""Credential validator tests: compiled schema checks and line numbering."""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cli"))
+
+import credential_validator as cv  # noqa: E402
+
+EXAMPLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples", "credential.ndjson")
+
+
+def example_record():
+    with open(EXAMPLE, encoding="utf-8") as f:
+        return json.loads(f.readline())
+
+
+class CompileSchemaTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.check = staticmethod(cv.load_validator())
+
+    def errors(self, record):
+        found = []
+        self.check(record, found)
+        return found
+
+    def test_example_is_valid(self):
+        self.assertEqual(self.errors(example_record()), [])
+
+    def test_trailing_newline_fails_anchors(self):
+        for field in ("did", "id", "created_at"):
+            with self.subTest(field=field):
+                record = example_record()
+                record[field] += "\n"
+                self.assertEqual([path for path, _ in self.errors(record)], [f"$.{field}"])
+
+    def test_non_ascii_digits(self):
+        record = example_record()
+        record["created_at"] = "٢٠٢٦-02-12T18:00:00.000Z"
+        self.assertEqual([path for path, _ in self.errors(record)], ["$.created_at"])
+
+    def test_error_paths(self):
+        record = example_record()
+        del record["source"]
+        record["status"] = "lost"
+        record["schema_version"] = 1.0
+        record["evidence"]["payload"] = []
+        found = self.errors(record)
+        self.assertIn(("$", "missing required property 'source'"), found)
+        self.assertIn("$.status", [path for path, _ in found])
+        self.assertIn(("$.schema_version", "is not of type string"), found)
+        self.assertIn(("$.evidence.payload", "is not of type object"), found)
+
+    def test_ecma_regex(self):
+        self.assertIsNone(cv.ecma_regex("^a$").search("a\n"))
+        self.assertIsNotNone(cv.ecma_regex("^a$").search("a"))
+        self.assertIsNotNone(cv.ecma_regex(r"^a\$$").search("a$"))
+        self.assertIsNotNone(cv.ecma_regex("^[$]$").search("$"))
+        self.assertIsNone(cv.ecma_regex(r"^\d$").search("٢"))
+
+    def test_schema_keywords(self):
+        check = cv.compile_schema({"type": "integer", "enum": [1, 2]})
+        found = []
+        check(True, found)
+        self.assertEqual(found, [("$", "is not of type integer")])
+        with self.assertRaises(ValueError):
+            cv.compile_schema({"type": "string", "oneOf": []})
+        closed = cv.compile_schema({"type": "object", "additionalProperties": False})
+        found = []
+        closed({"extra": 1}, found)
+        self.assertEqual(found, [("$", "unexpected property 'extra'")])
+
+
+class ValidateFileTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="sf-test-")
+        self.path = os.path.join(self.workdir, "credentials.ndjson")
+        good = json.dumps(example_record())
+        bad = json.dumps({**example_record(), "status": "lost"})
+        self.bad_lines = {7, 150, 151, 299}
+        with open(self.path, "w", encoding="utf-8") as f:
+            for number in range(1, 301):
+                if number == 42:
+                    f.write("\n")
+                elif number == 99:
+                    f.write("{not json\n")
+                else:
+                    f.write((bad if number in self.bad_lines else good) + "\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def test_validate_lines(self):
+        with open(self.path, "rb") as f:
+            lines, records, invalid, errors = cv.validate_lines(f, cv.load_validator())
+        self.assertEqual((lines, records, invalid), (300, 299, 5))
+        self.assertEqual([number for number, _, _ in errors], sorted(self.bad_lines | {99}))
+        number, path, message = errors[1]
+        self.assertEqual((number, path), (99, "$"))
+        self.assertTrue(message.startswith("invalid JSON"))
+
+    def test_max_errors(self):
+        with open(self.path, "rb") as f:
+            _, _, invalid, errors = cv.validate_lines(f, cv.load_validator(), max_errors=2)
+        self.assertEqual(invalid, 5)
+        self.assertEqual(len(errors), 2)
+
+    def test_workers_keep_line_numbers(self):
+        single = cv.validate_file(self.path)
+        chunk_bytes = os.path.getsize(self.path) // 7
+        self.assertGreater(len(cv.split_ranges(self.path, chunk_bytes)), 5)
+        parallel = cv.validate_file(self.path, workers=3, chunk_bytes=chunk_bytes)
+        self.assertEqual(parallel, single)
+        self.assertEqual([number for number, _, _ in parallel[2]], sorted(self.bad_lines | {99}))
+
+    def test_split_ranges_cover_file(self):
+        ranges = cv.split_ranges(self.path, 1000)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], os.path.getsize(self.path))
+        with open(self.path, "rb") as f:
+            data = f.read()
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(data[end - 1:end], b"\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""DID resolver tests: keeping the persisted index current as the registry changes."""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cli"))
+
+import did_resolver as dr  # noqa: E402
+
+DID = "did:tw:serviceverified:{:08d}"
+
+
+def record_line(n, status="approved"):
+    return json.dumps({"did": DID.format(n), "document": {"n": n, "status": status}}, separators=(",", ":")) + "\n"
+
+
+class DIDResolverTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="sf-test-")
+        self.registry = os.path.join(self.workdir, "registry.ndjson")
+        self.write("".join(record_line(n) for n in range(10)))
+        self.resolver = dr.DIDResolver(self.registry)
+        self.refreshes = 0
+        refresh = self.resolver.refresh
+
+        def counting_refresh(*args, **kwargs):
+            self.refreshes += 1
+            return refresh(*args, **kwargs)
+
+        self.resolver.refresh = counting_refresh
+
+    def tearDown(self):
+        self.resolver.close()
+        shutil.rmtree(self.workdir)
+
+    def write(self, text, mode="w"):
+        with open(self.registry, mode, encoding="utf-8") as f:
+            f.write(text)
+
+    def test_resolve(self):
+        self.assertEqual(self.resolver.resolve(DID.format(3)), {"n": 3, "status": "approved"})
+        self.assertIsNone(self.resolver.resolve(DID.format(99)))
+        self.assertEqual(self.refreshes, 0)
+
+    def test_append(self):
+        self.write(record_line(10) + record_line(3, "revoked"), "a")
+        self.assertEqual(self.resolver.resolve(DID.format(10))["n"], 10)
+        self.assertEqual(self.resolver.resolve(DID.format(3))["status"], "revoked")
+        self.assertEqual(self.refreshes, 1)
+
+    def test_partial_tail(self):
+        line = record_line(10)
+        self.write(line[:20], "a")
+        for _ in range(5):
+            self.assertIsNone(self.resolver.resolve(DID.format(10)))
+            self.assertEqual(self.resolver.resolve(DID.format(1))["n"], 1)
+        self.assertEqual(self.refreshes, 1)
+
+        self.write(line[20:], "a")
+        self.assertEqual(self.resolver.resolve(DID.format(10))["n"], 10)
+        self.assertEqual(self.refreshes, 2)
+
+    def test_truncate(self):
+        self.write("".join(record_line(n) for n in range(3)))
+        self.assertIsNone(self.resolver.resolve(DID.format(5)))
+        self.assertEqual(self.resolver.resolve(DID.format(2))["n"], 2)
+
+    def test_rewrite(self):
+        replacement = self.registry + ".new"
+        with open(replacement, "w", encoding="utf-8") as f:
+            f.write("".join(record_line(n) for n in range(100, 110)))
+        os.replace(replacement, self.registry)
+        self.assertIsNone(self.resolver.resolve(DID.format(1)))
+        self.assertEqual(self.resolver.resolve(DID.format(101))["n"], 101)
+
+    def test_table_growth(self):
+        count = int(dr.MIN_SLOTS * dr.MAX_LOAD) * 3
+        self.write("".join(record_line(n) for n in range(10, count)), "a")
+        self.assertEqual(self.resolver.resolve(DID.format(count - 1))["n"], count - 1)
+        self.assertEqual(self.resolver.index.count, count)
+        self.assertGreater(self.resolver.index.slots, dr.MIN_SLOTS)
+
+        with dr.DIDResolver(self.registry) as reopened:
+            self.assertEqual(reopened.index.slots, self.resolver.index.slots)
+            for n in range(count):
+                self.assertEqual(reopened.resolve(DID.format(n))["n"], n)
+
+
+if __name__ == "__main__":
+    unittest.main()
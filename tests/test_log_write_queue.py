@@ -0,0 +1,58 @@
+"""LogWriteQueue tests: group commits acknowledge each submission on its own."""
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cli"))
+
+import service_finder as sf  # noqa: E402
+
+
+class LogWriteQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="sf-test-")
+        sf.DB_NAME = os.path.join(self.workdir, "test.db")
+        with contextlib.redirect_stdout(io.StringIO()):
+            sf.setup_database()
+        self.writer = sf.LogWriteQueue(max_batch=50, max_delay=0.5)
+
+    def tearDown(self):
+        self.writer.close()
+        sf.close_db_connection()
+        shutil.rmtree(self.workdir)
+
+    def submit(self, hours, desc="Shift"):
+        return self.writer.submit(1, 1, "2026-03-01", hours, desc)
+
+    def logged(self):
+        conn = sf.get_db_connection()
+        return [tuple(row) for row in conn.execute("SELECT log_id, task_description FROM Service_Logs ORDER BY log_id")]
+
+    def test_batch_resolves_log_ids(self):
+        futures = [self.submit(1.0, f"Shift {i}") for i in range(5)]
+        ids = [future.result(timeout=5) for future in futures]
+        self.writer.close()
+        self.assertEqual(ids, list(range(1, 6)))
+        self.assertEqual(self.writer.batches, 1)
+        self.assertEqual(self.logged(), [(i, f"Shift {i - 1}") for i in ids])
+
+    def test_bad_row_fails_alone(self):
+        futures = [self.submit(1.0, f"Shift {i}") for i in range(3)]
+        bad = self.submit(float("nan"), "Bad")
+        futures += [self.submit(1.0, f"Shift {i}") for i in range(3, 5)]
+        with self.assertRaises(sf.sqlite3.IntegrityError):
+            bad.result(timeout=5)
+        ids = [future.result(timeout=5) for future in futures]
+        self.writer.close()
+        self.assertEqual(self.writer.rows, 5)
+        self.assertEqual(self.logged(), [(log_id, f"Shift {i}") for i, log_id in enumerate(ids)])
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(sf.verify_chain(True), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
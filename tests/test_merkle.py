@@ -0,0 +1,160 @@
+"""Merkle inclusion proof tests, checked against an independent RFC 6962 implementation."""
+import contextlib
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cli"))
+
+import service_finder as sf  # noqa: E402
+
+LOGS = 33  # covers every shape of tree up to 2**5 + 1 leaves
+
+
+def sha256(data):
+    return hashlib.sha256(data).digest()
+
+
+def reference_mth(leaves):
+    """RFC 6962 section 2.1 Merkle Tree Hash, written from the spec."""
+    if len(leaves) == 1:
+        return sha256(b"\x00" + leaves[0])
+    k = 1
+    while k * 2 < len(leaves):
+        k *= 2
+    return sha256(b"\x01" + reference_mth(leaves[:k]) + reference_mth(leaves[k:]))
+
+
+def reference_verify(leaf_index, tree_size, leaf_data, path, root):
+    """RFC 9162 section 2.1.3.2 iterative inclusion proof verification."""
+    if leaf_index >= tree_size:
+        return False
+    fn, sn = leaf_index, tree_size - 1
+    r = sha256(b"\x00" + leaf_data)
+    for p in path:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = sha256(b"\x01" + p + r)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = sha256(b"\x01" + r + p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r == root
+
+
+class MerkleProofTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="sf-test-")
+        sf.DB_NAME = os.path.join(self.workdir, "test.db")
+        sf.USER_ID = 1
+        self.saved_key = os.environ.pop(sf.SIGNING_KEY_ENV, None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sf.setup_database()
+            sf.log_hours_bulk((1, 1.0 + i % 4, f"Shift {i}", "2026-02-01") for i in range(LOGS))
+        self.conn = sf.get_db_connection()
+
+    def tearDown(self):
+        sf.close_db_connection()
+        os.environ.pop(sf.SIGNING_KEY_ENV, None)
+        if self.saved_key is not None:
+            os.environ[sf.SIGNING_KEY_ENV] = self.saved_key
+        shutil.rmtree(self.workdir)
+
+    def quiet(self, fn, *args):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return fn(*args)
+
+    def write_proof(self, proof, name="proof.json"):
+        path = os.path.join(self.workdir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(proof, f)
+        return path
+
+    def test_paths_match_reference(self):
+        cursor = self.conn.cursor()
+        entries = [row[0] for row in cursor.execute("SELECT entry_hash FROM Log_Chain ORDER BY log_id")]
+        self.assertEqual(len(entries), LOGS)
+        for size in range(1, LOGS + 1):
+            root = reference_mth(entries[:size])
+            self.assertEqual(sf.merkle_subtree(cursor, 0, size), root, f"size {size}")
+            for index in range(size):
+                path = sf.merkle_path(cursor, index, 0, size)
+                self.assertTrue(reference_verify(index, size, entries[index], path, root), f"{index}/{size}")
+                self.assertEqual(sf.root_from_path(sf.merkle_leaf(entries[index]), index, size, path), root)
+
+    def test_prove_requires_published_root(self):
+        self.assertIsNone(self.quiet(sf.prove_entry, 1))
+        self.quiet(sf.publish_merkle_root)
+        self.assertIsNone(self.quiet(sf.prove_entry, 1, 10))
+        self.assertEqual(self.quiet(sf.prove_entry, 1)["tree_size"], LOGS)
+
+    def test_trusted_root(self):
+        published = self.quiet(sf.publish_merkle_root)
+        path = self.write_proof(self.quiet(sf.prove_entry, 5))
+        self.assertFalse(self.quiet(sf.verify_proof, path))
+        self.assertTrue(self.quiet(sf.verify_proof, path, published["root"]))
+        self.assertFalse(self.quiet(sf.verify_proof, path, "00" * 32))
+
+    def test_forged_proof_rejected(self):
+        published = self.quiet(sf.publish_merkle_root)
+        proof = self.quiet(sf.prove_entry, 5)
+        proof["entry"][4] = 500.0
+        # Recompute a self-consistent root for the forged entry, as a forger would.
+        entry_hash = sf.chain_hash(bytes.fromhex(proof["prev_hash"]), proof["entry"])
+        path = [bytes.fromhex(h) for h in proof["path"]]
+        proof["root"] = sf.root_from_path(sf.merkle_leaf(entry_hash), proof["leaf_index"], proof["tree_size"], path).hex()
+        forged = self.write_proof(proof)
+        self.assertFalse(self.quiet(sf.verify_proof, forged))
+        self.assertFalse(self.quiet(sf.verify_proof, forged, published["root"]))
+        os.environ[sf.SIGNING_KEY_ENV] = "secret"
+        self.assertFalse(self.quiet(sf.verify_proof, forged))
+
+    def test_forged_supervisor_rejected(self):
+        published = self.quiet(sf.publish_merkle_root)
+        proof = self.quiet(sf.prove_entry, 5)
+        proof["entry"][-1] = "Forged Judge"
+        self.assertFalse(self.quiet(sf.verify_proof, self.write_proof(proof), published["root"]))
+
+    def test_signed_root(self):
+        os.environ[sf.SIGNING_KEY_ENV] = "secret"
+        self.quiet(sf.publish_merkle_root)
+        proof = self.quiet(sf.prove_entry, 7)
+        self.assertEqual(proof["signature_alg"], "HMAC-SHA256")
+        path = self.write_proof(proof)
+        self.assertTrue(self.quiet(sf.verify_proof, path))
+
+        os.environ[sf.SIGNING_KEY_ENV] = "other"
+        self.assertFalse(self.quiet(sf.verify_proof, path))
+
+        os.environ[sf.SIGNING_KEY_ENV] = "secret"
+        proof["signed_at"] = "2000-01-01T00:00:00+00:00"
+        self.assertFalse(self.quiet(sf.verify_proof, self.write_proof(proof, "resigned.json")))
+
+    def test_unsigned_root_needs_trusted_root(self):
+        self.quiet(sf.publish_merkle_root)
+        path = self.write_proof(self.quiet(sf.prove_entry, 3))
+        os.environ[sf.SIGNING_KEY_ENV] = "secret"
+        self.assertFalse(self.quiet(sf.verify_proof, path))
+
+    def test_earlier_published_size(self):
+        cursor = self.conn.cursor()
+        self.quiet(sf.publish_merkle_root)
+        self.quiet(sf.log_hours_entry, 1, 2.0, "Later shift", "2026-02-02")
+        self.quiet(sf.publish_merkle_root)
+        proof = self.quiet(sf.prove_entry, 3, LOGS)
+        self.assertEqual(proof["tree_size"], LOGS)
+        self.assertTrue(self.quiet(sf.verify_proof, self.write_proof(proof), sf.merkle_subtree(cursor, 0, LOGS).hex()))
+        self.assertEqual(self.quiet(sf.prove_entry, 3)["tree_size"], LOGS + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""ServiceAPI tests: POST /log validates entries like --import-csv does."""
+import asyncio
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cli"))
+
+import service_api  # noqa: E402
+import service_finder as sf  # noqa: E402
+
+
+class LogRouteTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="sf-test-")
+        sf.DB_NAME = os.path.join(self.workdir, "test.db")
+        sf.USER_ID = 1
+        with contextlib.redirect_stdout(io.StringIO()):
+            sf.setup_database()
+        self.api = service_api.ServiceAPI(workers=2)
+
+    def tearDown(self):
+        self.api.close()
+        sf.close_db_connection()
+        shutil.rmtree(self.workdir)
+
+    def post(self, body):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        try:
+            return asyncio.run(self.api.dispatch("POST", "/log", {}, body))
+        except service_api.HTTPError as exc:
+            return exc.status, str(exc)
+
+    def entry(self, **fields):
+        return {"agency_id": 1, "hours": 2.0, "description": "Shift", "date": "2026-03-01", **fields}
+
+    def test_valid_entry(self):
+        status, result = self.post(self.entry())
+        self.assertEqual(status, 201)
+        self.assertEqual(result, {"log_id": 1})
+
+    def test_rejects_bad_hours(self):
+        for body in (
+            b'{"agency_id": 1, "hours": NaN}',
+            b'{"agency_id": 1, "hours": Infinity}',
+            self.entry(hours="inf"),
+            self.entry(hours=-40),
+            self.entry(hours=0),
+        ):
+            with self.subTest(body=body):
+                self.assertEqual(self.post(body)[0], 400)
+
+    def test_rejects_unknown_ids(self):
+        status, message = self.post(self.entry(user_id=424242))
+        self.assertEqual(status, 400)
+        self.assertIn("user_id", message)
+        self.assertEqual(self.post(self.entry(agency_id=999))[0], 400)
+        count = sf.get_db_connection().execute("SELECT COUNT(*) FROM Service_Logs").fetchone()[0]
+        self.assertEqual(count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()